@@ -0,0 +1,6 @@
+"""
+Shared helpers for the cross-national and domestic study scripts.
+
+The numbered scripts under `src/cross-national study/` and `src/domestic-study/`
+stay the entry points; this package holds the pieces they have in common.
+"""
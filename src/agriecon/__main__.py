@@ -0,0 +1,5 @@
+import sys
+
+from agriecon.cli import main
+
+sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+Title: Command-Line Entry Point for the Pipeline Stages
+
+Usage (from `src/`):
+    python -m agriecon --list
+    python -m agriecon gdd
+    python -m agriecon cross-merge
+    python -m agriecon paths
+    python -m agriecon report
+
+Each subcommand runs one numbered script. The scripts are only located and
+executed when their subcommand is chosen, so data-only stages (download, GDD,
+merges) never import seaborn / matplotlib / statsmodels / linearmodels and
+start in a fraction of a second.
+"""
+
+import argparse
+import os
+import runpy
+import sys
+import time
+
+from agriecon import config
+
+# 子命令 -> (脚本路径或 agriecon 模块名, 说明)
+COMMANDS = {
+    "cross-clean": ("cross-national study/1_clean data.py", "Clean FAO, OWID and control data"),
+    "cross-merge": ("cross-national study/2_merge data.py", "Build merged_agri_climate_control.csv"),
+    "cross-describe": ("cross-national study/3_descriptive statistics  .py", "Descriptive statistics"),
+    "cross-plot": ("cross-national study/4_visualization.py", "Cross-national figures"),
+    "cross-regress": ("cross-national study/6_regression.py", "OLS and two-way FE regressions"),
+    "cross-features": ("cross-national study/7_panel_features.py", "Lagged / rolling climate features"),
+    "download": ("domestic-study/1_download_nasa_temperature_data.py", "Download NASA POWER daily temperatures"),
+    "gdd": ("domestic-study/2_calculate_gdd.py", "Annual GDD per city"),
+    "merge-yield": ("domestic-study/3_merge_yield_with_gdd.py", "Build panel_yield_gdd.csv"),
+    "regress": ("domestic-study/4_run_regression_panel_yield_gdd.py", "Fixed-effect yield ~ GDD regression"),
+    "regress-plot": ("domestic-study/5_regression_and_visualization.py", "Year-FE regression and figure"),
+    "features": ("domestic-study/6_build_panel_features.py", "Lagged / rolling GDD features"),
+    "scenarios": ("domestic-study/7_score_climate_scenarios.py", "Predicted yields under +0..+3 °C"),
+    "report": ("agriecon.report", "Assemble reports/report.md and report.html"),
+}
+
+
+def run_module(name):
+    """Run a package module (e.g. agriecon.report) as __main__."""
+    runpy.run_module(name, run_name="__main__", alter_sys=True)
+
+
+def run_script(relative_path):
+    """Run one numbered script as __main__ with its own folder first on sys.path."""
+    path = os.path.join(config.SRC_DIR, relative_path)
+    folder = os.path.dirname(path)
+    # 与 `python script.py` 相同：脚本所在目录优先，只插入一次
+    if folder not in sys.path:
+        sys.path.insert(0, folder)
+    runpy.run_path(path, run_name="__main__")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="agriecon", description="GRASPP 2025 AgriEcon pipeline")
+    parser.add_argument("--list", action="store_true", help="list the available stages")
+    parser.add_argument("--time", action="store_true", help="print the run time of the stage")
+    sub = parser.add_subparsers(dest="command")
+    for name, (_, help_text) in COMMANDS.items():
+        sub.add_parser(name, help=help_text)
+    sub.add_parser("paths", help="print the configured paths and settings")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, (script, help_text) in COMMANDS.items():
+            print(f"{name:16s} {help_text}  [{script}]")
+        return 0
+    if args.command is None:
+        parser.print_help()
+        return 1
+    if args.command == "paths":
+        for key, value in config.settings().items():
+            print(f"{key:32s} {value}")
+        return 0
+
+    start = time.perf_counter()
+    target = COMMANDS[args.command][0]
+    if target.startswith("agriecon."):
+        run_module(target)
+    else:
+        run_script(target)
+    if args.time:
+        print(f"[{args.command}] finished in {time.perf_counter() - start:.2f}s")
+    return 0
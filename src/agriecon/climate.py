@@ -0,0 +1,174 @@
+"""
+Title: Monthly Temperature Cube and Seasonal Climate Features
+
+Purpose:
+    The OWID table `monthly-average-surface-temperatures-by-year.csv` has one row
+    per country and month (the column called "Year" is actually the month 1-12)
+    and one column per year. Melting it and then averaging by (Country, Year)
+    throws the seasonal structure away. Here the table is kept as a compact
+    float32 cube of shape (country, year, month), and the climate features used
+    by the regressions are computed from it with NumPy reductions:
+
+        - annual_mean:     mean over the 12 months (same as the old groupby mean)
+        - gs_mean:         growing-season mean (April-September by default)
+        - gs_anomaly:      growing-season mean minus its baseline climatology
+        - anom_mNN:        monthly anomaly against the baseline climatology
+        - max_anomaly:     largest monthly anomaly of the year
+        - degree_months_T: sum over months of max(0, temperature - T)
+        - months_above_T:  number of months with temperature above T
+
+    An aggregate is NaN when any month in its window is missing, so a year
+    that only has January-April data (e.g. the current year in OWID) does not
+    look like a full year with a low mean.
+
+    The cube is cached as `.npz` and the country-year features as CSV in
+    `data/processed/cross-national study/`, so the regression stages read them
+    directly instead of re-melting the raw table. The arguments used to build
+    them are stored in the `.npz`; changing them triggers a rebuild.
+"""
+
+import json
+import os
+import warnings
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+MONTHS = np.arange(1, 13)
+GROWING_SEASON = (4, 5, 6, 7, 8, 9)
+BASELINE = (1961, 1990)
+THRESHOLDS = (20, 25)
+
+
+@contextmanager
+def _ignore_empty_mean():
+    """Silence the 'Mean of empty slice' warning for all-NaN country-years."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        yield
+
+
+def load_monthly_cube(path, countries=None):
+    """
+    Read the OWID monthly temperature table into a (country, year, month) cube.
+
+    Returns:
+        dict with "values" (float32 array), "countries", "years" and "months"
+    """
+    raw = pd.read_csv(path)
+    if countries is not None:
+        raw = raw[raw["Entity"].isin(countries)]
+    year_cols = sorted((c for c in raw.columns if c.isdigit()), key=int)
+
+    country_codes, country_names = pd.factorize(raw["Entity"], sort=True)
+    month_idx = raw["Year"].to_numpy(dtype=int) - 1  # OWID 的 "Year" 列其实是月份
+
+    values = np.full((len(country_names), len(year_cols), 12), np.nan, dtype=np.float32)
+    # 一次花式索引写入整个立方体
+    values[country_codes, :, month_idx] = raw[year_cols].to_numpy(dtype=np.float32)
+
+    return {
+        "values": values,
+        "countries": np.asarray(country_names, dtype=str),
+        "years": np.array([int(c) for c in year_cols]),
+        "months": MONTHS,
+    }
+
+
+def save_cube(cube, path, params=None):
+    """Write the cube to `.npz`, with the build arguments as a JSON string."""
+    np.savez_compressed(path, **cube, params=json.dumps(params or {}, sort_keys=True))
+
+
+def load_cube(path):
+    with np.load(path) as data:
+        return {key: data[key] for key in data.files if key != "params"}
+
+
+def cube_params(path):
+    """Build arguments stored with a cached cube ({} for older files)."""
+    with np.load(path) as data:
+        return json.loads(str(data["params"])) if "params" in data.files else {}
+
+
+def monthly_climatology(cube, baseline=BASELINE):
+    """Mean temperature of each country and month over the baseline years, shape (country, 1, month)."""
+    in_base = (cube["years"] >= baseline[0]) & (cube["years"] <= baseline[1])
+    with _ignore_empty_mean():
+        return np.nanmean(cube["values"][:, in_base, :], axis=1, keepdims=True)
+
+
+def monthly_anomalies(cube, baseline=BASELINE):
+    """Monthly anomalies against the baseline climatology, same shape as the cube."""
+    return cube["values"] - monthly_climatology(cube, baseline)
+
+
+def season_mean(values, months=GROWING_SEASON):
+    """Mean over the given calendar months (last axis); NaN if any month is missing."""
+    idx = np.asarray(months) - 1
+    return values[..., idx].mean(axis=-1)
+
+
+def climate_features(cube, months=GROWING_SEASON, baseline=BASELINE, thresholds=THRESHOLDS):
+    """
+    Country-year climate features computed from the cube.
+
+    Returns:
+        long DataFrame with one row per (Country, Year)
+    """
+    values = cube["values"]
+    anom = monthly_anomalies(cube, baseline)
+    incomplete = np.isnan(values).any(axis=2)
+
+    # 12 个月都有数据才计算全年指标，缺月则为 NaN
+    features = {
+        "annual_mean": values.mean(axis=2),
+        "gs_mean": season_mean(values, months),
+        "gs_anomaly": season_mean(anom, months),
+        "max_anomaly": anom.max(axis=2),
+    }
+    for t in thresholds:
+        features[f"degree_months_{t}"] = np.clip(values - t, 0, None).sum(axis=2)
+        features[f"months_above_{t}"] = np.where(incomplete, np.nan, (values > t).sum(axis=2))
+    for m in cube["months"]:
+        features[f"anom_m{m:02d}"] = anom[:, :, m - 1]
+
+    n_countries, n_years = values.shape[:2]
+    frame = pd.DataFrame({
+        "Country": np.repeat(cube["countries"], n_years),
+        "Year": np.tile(cube["years"], n_countries),
+    })
+    frame = frame.assign(**{name: arr.reshape(-1) for name, arr in features.items()})
+    counts = [f"months_above_{t}" for t in thresholds]
+    frame[counts] = frame[counts].astype("Int64")
+    # 整年缺失的国家-年份不保留；部分月份缺失的保留月度距平
+    has_data = ~np.isnan(values).all(axis=2).reshape(-1)
+    return frame[has_data].reset_index(drop=True)
+
+
+def cached_climate_features(raw_path, cube_path, features_path, countries=None,
+                            months=GROWING_SEASON, baseline=BASELINE, thresholds=THRESHOLDS):
+    """
+    Return the climate features, rebuilding the cube and features if the raw
+    table is newer than the cached files or the arguments have changed.
+    """
+    params = {
+        "countries": sorted(countries) if countries is not None else None,
+        "months": list(months),
+        "baseline": list(baseline),
+        "thresholds": list(thresholds),
+    }
+    cached = (
+        os.path.exists(cube_path) and os.path.exists(features_path)
+        and os.path.getmtime(features_path) >= os.path.getmtime(raw_path)
+        and cube_params(cube_path) == params
+    )
+    if cached:
+        return pd.read_csv(features_path)
+
+    cube = load_monthly_cube(raw_path, countries=countries)
+    save_cube(cube, cube_path, params)
+    features = climate_features(cube, months=months, baseline=baseline, thresholds=thresholds)
+    features.to_csv(features_path, index=False)
+    return features
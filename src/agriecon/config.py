@@ -0,0 +1,96 @@
+"""
+Title: Project Paths and Study Settings
+
+Purpose:
+    One place for the folders, country lists, city coordinates and constants
+    that the scripts used to hard-code (e.g. '../../data/processed/cross-national study',
+    'nasa_power_gdd_raw', T_BASE = 10). All paths are absolute and built from
+    the location of this file, so every script works from any working directory.
+
+    The data root can be moved with the environment variable AGRIECON_DATA
+    (e.g. on a batch worker with the data on another disk).
+
+    This module only uses the standard library, so importing it is cheap.
+"""
+
+import os
+
+# 项目路径
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_ROOT = os.path.dirname(SRC_DIR)
+DATA_DIR = os.environ.get("AGRIECON_DATA", os.path.join(PROJECT_ROOT, "data"))
+RAW_DIR = os.path.join(DATA_DIR, "raw")
+PROCESSED_DIR = os.path.join(DATA_DIR, "processed")
+RESULTS_DIR = os.path.join(PROJECT_ROOT, "results")
+FIGURE_DIR = os.path.join(PROJECT_ROOT, "figure")
+
+# Cross-national study
+CROSS_RAW_DIR = os.path.join(RAW_DIR, "cross-national study")
+CROSS_PROCESSED_DIR = os.path.join(PROCESSED_DIR, "cross-national study")
+CROSS_FIGURE_DIR = os.path.join(FIGURE_DIR, "cross-national study")
+FAO_PRODUCTION_FILE = os.path.join(
+    CROSS_RAW_DIR, "Agricultural Production_FAO", "Agricultural Production_FAO",
+    "Production_Crops_Livestock_E_All_Data_NOFLAG.csv",
+)
+OWID_DIR = os.path.join(CROSS_RAW_DIR, "climate_data _OWID", "climate_data _OWID")
+OWID_MONTHLY_TEMPERATURE_FILE = os.path.join(
+    OWID_DIR, "monthly-average-surface-temperatures-by-year",
+    "monthly-average-surface-temperatures-by-year.csv",
+)
+OWID_PRECIPITATION_FILE = os.path.join(
+    OWID_DIR, "average-precipitation-per-year", "average-precipitation-per-year.csv",
+)
+
+TARGET_COUNTRIES = ["Japan", "Germany", "Spain", "Italy"]
+ISO3_TO_NAME = {
+    "JPN": "Japan",
+    "DEU": "Germany",
+    "ESP": "Spain",
+    "ITA": "Italy",
+}
+TARGET_ISO3 = list(ISO3_TO_NAME)
+# 国家几何中心的大致经纬度（用于 Conley 空间标准误）
+COUNTRY_COORDS = {
+    "Japan": {"lat": 36.20, "lon": 138.25},
+    "Germany": {"lat": 51.17, "lon": 10.45},
+    "Spain": {"lat": 40.46, "lon": -3.75},
+    "Italy": {"lat": 41.87, "lon": 12.57},
+}
+
+# Domestic study
+DOMESTIC_RAW_DIR = os.path.join(RAW_DIR, "domestic_study_data")
+DOMESTIC_PROCESSED_DIR = os.path.join(PROCESSED_DIR, "domestic_study_data")
+DOMESTIC_FIGURE_DIR = os.path.join(FIGURE_DIR, "Domestic_studies")
+NASA_RAW_DIR = os.path.join(DOMESTIC_RAW_DIR, "nasa_power_gdd_raw")
+
+CITIES = {
+    "Harbin": {"lat": 45.75, "lon": 126.63},
+    "Changchun": {"lat": 43.88, "lon": 125.35},
+    "Shenyang": {"lat": 41.80, "lon": 123.43},
+}
+CITY_TO_PROVINCE = {
+    "Harbin": "Heilongjiang",
+    "Changchun": "Jilin",
+    "Shenyang": "Liaoning",
+}
+PROVINCES = list(CITY_TO_PROVINCE.values())
+# 省份坐标取其代表城市（省会）
+PROVINCE_COORDS = {p: CITIES[c] for c, p in CITY_TO_PROVINCE.items()}
+START_YEAR = 2005
+END_YEAR = 2023
+T_BASE = 10  # GDD 基准温度 (°C)
+
+
+def cross_processed(name):
+    """Path of a file in data/processed/cross-national study."""
+    return os.path.join(CROSS_PROCESSED_DIR, name)
+
+
+def domestic_processed(name):
+    """Path of a file in data/processed/domestic_study_data."""
+    return os.path.join(DOMESTIC_PROCESSED_DIR, name)
+
+
+def settings():
+    """All upper-case settings as a dict (used by `python -m agriecon paths`)."""
+    return {k: v for k, v in globals().items() if k.isupper()}
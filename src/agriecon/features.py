@@ -0,0 +1,212 @@
+"""
+Title: Panel Climate Features (Lags, Leads, Rolling Windows, Anomalies)
+
+Purpose:
+    Adaptation studies need more than the same-year climate value: last year's
+    temperature, the average of the last few growing seasons, or how far a year
+    is from the long-run climatology of that country / province. This module
+    builds these features for every entity of a panel at once.
+
+    Example:
+        FEATURES = [
+            {"op": "lag", "column": "Annual_GDD", "k": 1},
+            {"op": "rolling_mean", "column": "Annual_GDD", "window": 3},
+            {"op": "anomaly", "column": "Annual_GDD", "baseline": (2005, 2014)},
+        ]
+        panel = add_panel_features(panel, FEATURES, entity="province", time="year")
+
+Method:
+    - The entity columns are factorized to integer codes and the panel is sorted
+      once by (code, time). All features are then computed on this sorted array
+      in one pass with NumPy; there is no groupby().apply or per-entity loop.
+    - Lags / leads look up the row of the same entity at time t - k (t + k)
+      with one searchsorted on the combined (code, time) key, so they work
+      across gaps in the panel; a missing year t - k gives NaN.
+    - Rolling means / stds use a strided window view of the sorted array; a
+      window is valid only if it stays in one entity and covers `window`
+      consecutive periods.
+    - Anomalies subtract the entity mean over the baseline period (the whole
+      sample if no baseline is given), computed with np.bincount.
+
+Note:
+    Keys must be unique. The cross-national merged file has several rows per
+    Country x Item x Year: one per unit (eggs are reported both in t and in
+    1000 No) times one per monthly climate record. Collapse it first with
+    `collapse_keys` using ["Country", "Item", "Unit"] as the entity, so values
+    in different units are never averaged together.
+
+    Time must be integer-valued (e.g. years); other values raise ValueError
+    instead of being truncated.
+"""
+
+import numpy as np
+
+FEATURE_OPS = ("lag", "lead", "rolling_mean", "rolling_std", "anomaly")
+
+
+def feature_name(spec):
+    """Name of the new column created by one feature spec."""
+    if spec.get("name"):
+        return spec["name"]
+    op, col = spec["op"], spec["column"]
+    if op in ("lag", "lead"):
+        return f"{op}{spec.get('k', 1)}_{col}"
+    if op in ("rolling_mean", "rolling_std"):
+        return f"{op.replace('rolling_', 'roll')}{spec['window']}_{col}"
+    return f"anom_{col}"
+
+
+def integer_time(time):
+    """Time stamps as int64; raise ValueError if any value is not a whole number."""
+    time = np.asarray(time)
+    if np.issubdtype(time.dtype, np.integer):
+        return time.astype(np.int64, copy=False)
+    values = time.astype(float)
+    if not np.all(np.isfinite(values) & (values == np.round(values))):
+        bad = values[~(np.isfinite(values) & (values == np.round(values)))][:3]
+        raise ValueError(f"time must be integer-valued, got e.g. {bad.tolist()}")
+    return values.astype(np.int64)
+
+
+def panel_codes(df, entity, time):
+    """Integer entity codes and integer time for a panel sorted by (entity, time)."""
+    entity = [entity] if isinstance(entity, str) else list(entity)
+    codes = df.groupby(entity, sort=False).ngroup().to_numpy()
+    t = integer_time(df[time].to_numpy())
+    return codes, t
+
+
+def shift_within(values, codes, time, k):
+    """
+    Value of the same entity k periods earlier (k > 0 lag, k < 0 lead).
+
+    `values`, `codes` and `time` must already be sorted by (entity, time).
+    Each row is matched to the row with the same entity code and time - k
+    (not to the row k places earlier), so gaps in the panel are handled;
+    rows without such a match get NaN.
+
+    Example (year 2002 is missing):
+        >>> shift_within(np.array([[1.], [2.], [3.], [4.]]), np.zeros(4, int),
+        ...              np.array([2000, 2001, 2003, 2004]), 2).ravel()
+        array([nan, nan,  2., nan])
+    """
+    values = np.asarray(values, dtype=float)
+    out = np.full(values.shape, np.nan)
+    n = values.shape[0]
+    if n == 0:
+        return out
+    time = integer_time(time)
+    t0 = time - time.min()
+    span = int(t0.max()) + 1
+    # (code, time) 合成一个有序整数键，查找 (code, time - k)
+    key = np.asarray(codes, dtype=np.int64) * span + t0
+    target = t0 - k
+    valid = (target >= 0) & (target < span)
+    want = key - k
+    pos = np.clip(np.searchsorted(key, want), 0, n - 1)
+    found = valid & (key[pos] == want)
+    out[found] = values[pos[found]]
+    return out
+
+
+def rolling_within(values, codes, time, window, stat="mean"):
+    """
+    Trailing rolling mean / std over `window` consecutive periods inside each entity.
+
+    Uses a strided window view of the sorted block, so all windows of all
+    entities are reduced in one NumPy call. Missing values inside a window make
+    that window NaN.
+    """
+    n = values.shape[0]
+    out = np.full(values.shape, np.nan)
+    if window < 1 or window > n:
+        return out
+    first = np.arange(n - window + 1)
+    last = first + window - 1
+    same = (codes[first] == codes[last]) & (time[last] - time[first] == window - 1)
+
+    # 形状 (n - window + 1, 列数, window)
+    windows = np.lib.stride_tricks.sliding_window_view(values, window, axis=0)
+    if stat == "mean":
+        result = windows.mean(axis=2)
+    else:
+        result = windows.std(axis=2, ddof=1) if window > 1 else np.full(windows.shape[:2], np.nan)
+    out[last] = np.where(same[:, None], result, np.nan)
+    return out
+
+
+def anomaly_within(values, codes, time, baseline=None):
+    """Deviation of each value from its entity mean over the baseline period."""
+    in_base = np.ones(len(time), dtype=bool)
+    if baseline is not None:
+        in_base = (time >= baseline[0]) & (time <= baseline[1])
+    n_groups = codes.max() + 1 if len(codes) else 0
+    out = np.empty(values.shape)
+    for j in range(values.shape[1]):
+        col = values[:, j]
+        ok = in_base & ~np.isnan(col)
+        sums = np.bincount(codes[ok], weights=col[ok], minlength=n_groups)
+        counts = np.bincount(codes[ok], minlength=n_groups)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            clim = sums / counts
+        out[:, j] = col - clim[codes]
+    return out
+
+
+def collapse_keys(df, entity, time, columns, how="mean"):
+    """Collapse duplicate (entity, time) rows, e.g. monthly climate rows, to one row."""
+    entity = [entity] if isinstance(entity, str) else list(entity)
+    return df.groupby(entity + [time], as_index=False, sort=True)[list(columns)].agg(how)
+
+
+def add_panel_features(df, features, entity, time):
+    """
+    Add lag / lead / rolling / anomaly features to a panel.
+
+    Parameters:
+        df: panel DataFrame with unique (entity, time) keys
+        features: list of dicts with keys "op", "column" and, depending on op,
+            "k" (lag / lead, default 1), "window" (rolling), "baseline"
+            (anomaly, (first_year, last_year)) and optionally "name"
+        entity: entity column or list of columns
+        time: integer time column (e.g. year)
+
+    Returns:
+        DataFrame sorted by (entity, time) with one new column per feature.
+    """
+    entity = [entity] if isinstance(entity, str) else list(entity)
+    for spec in features:
+        if spec["op"] not in FEATURE_OPS:
+            raise ValueError(f"Unknown feature op: {spec['op']}")
+    if df.duplicated(subset=entity + [time]).any():
+        raise ValueError(
+            f"Panel keys {entity + [time]} are not unique; collapse duplicates first"
+        )
+
+    out = df.sort_values(entity + [time], kind="stable").reset_index(drop=True)
+    codes, t = panel_codes(out, entity, time)
+
+    new_cols = {}
+    # 按 (op, 参数) 分组，同组的列一起计算
+    groups = {}
+    for spec in features:
+        param = spec.get("k", 1) if spec["op"] in ("lag", "lead") else \
+            spec.get("window") if spec["op"].startswith("rolling") else \
+            tuple(spec["baseline"]) if spec.get("baseline") is not None else None
+        groups.setdefault((spec["op"], param), []).append(spec)
+
+    for (op, param), specs in groups.items():
+        values = out[[s["column"] for s in specs]].to_numpy(dtype=float)
+        if op == "lag":
+            result = shift_within(values, codes, t, param)
+        elif op == "lead":
+            result = shift_within(values, codes, t, -param)
+        elif op == "rolling_mean":
+            result = rolling_within(values, codes, t, param, stat="mean")
+        elif op == "rolling_std":
+            result = rolling_within(values, codes, t, param, stat="std")
+        else:
+            result = anomaly_within(values, codes, t, baseline=param)
+        new_cols.update(dict(zip([feature_name(s) for s in specs], result.T)))
+
+    return out.assign(**new_cols)
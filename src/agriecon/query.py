@@ -0,0 +1,180 @@
+"""
+Title: Lazy Panel Assembly with DuckDB
+
+Purpose:
+    `2_merge data.py` used to read three full CSVs into pandas and chain two
+    merges; `6_regression.py` re-read the same inputs and merged them again
+    with different country keys. This module expresses the whole assembly as a
+    single DuckDB query over the CSV / Parquet files:
+
+        filter (countries, items, years, Element = Production)
+          -> reshape (FAO wide Y1961..Y20xx columns to long, if needed)
+          -> join (agri LEFT JOIN (climate INNER JOIN controls))
+          -> aggregate (optional: total production per Country-Year,
+                        one climate row per Country-Year)
+
+    DuckDB only reads the columns used by the query, applies the filters while
+    scanning the files (before the joins), runs multithreaded, and can stream
+    the result straight to CSV / Parquet without building the intermediate
+    tables in memory.
+
+Country keys:
+    FAO and OWID use country names ("Area" / "Country"), the global_macro_data
+    controls use ISO3 codes. Controls get their "Country" from `iso3_to_name`
+    and fall back to the `countryname` column, so the same key is used by every
+    stage.
+"""
+
+import os
+
+import duckdb
+
+from agriecon.config import ISO3_TO_NAME
+
+DEFAULT_SOURCES = {
+    "agri": "agricultural_production_data_LongPanel.csv",
+    "climate": "climate_data.csv",
+    "control": "four_country_control_variables.csv",
+}
+
+
+def _quote(value):
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _ident(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _scan(path):
+    """DuckDB table function reading a CSV or Parquet file."""
+    if path.endswith(".parquet"):
+        return f"read_parquet({_quote(path)})"
+    return f"read_csv_auto({_quote(path)}, header=true)"
+
+
+def _is_wide_fao(con, path):
+    cols = [row[0] for row in con.execute(f"DESCRIBE SELECT * FROM {_scan(path)}").fetchall()]
+    return any(c.startswith("Y") and c[1:].isdigit() for c in cols)
+
+
+def panel_query(sources, countries=None, items=None, years=None, columns=None,
+                aggregate_items=False, collapse_climate=False, how="left",
+                iso3_to_name=None, con=None):
+    """
+    Build the SQL text of the merged agri x climate x control panel.
+
+    Parameters:
+        sources: dict with "agri", "climate" and "control" file paths
+        countries, items: optional lists to keep (pushed into the file scans)
+        years: optional (first, last) year range
+        columns: optional list of output columns (default: all)
+        aggregate_items: sum Value over items into Total_Production per Country-Year
+        collapse_climate: average the monthly climate rows to one row per Country-Year
+        how: join type between agri and climate+controls ("left" as in 2_merge data.py)
+        iso3_to_name: ISO3 -> country name map for the control table
+    """
+    con = con or duckdb.connect()
+    iso3_to_name = ISO3_TO_NAME if iso3_to_name is None else iso3_to_name
+
+    def where(country_col=None, year_col=None, extra=()):
+        conds = list(extra)
+        if countries is not None and country_col is not None:
+            conds.append(f"{country_col} IN ({', '.join(map(_quote, countries))})")
+        if years is not None and year_col is not None:
+            conds.append(f"{year_col} BETWEEN {int(years[0])} AND {int(years[1])}")
+        return ("WHERE " + " AND ".join(conds)) if conds else ""
+
+    # (1) 农业产量：过滤 -> 宽转长
+    item_filter = [f"Item IN ({', '.join(map(_quote, items))})"] if items is not None else []
+    agri_path = sources["agri"]
+    if _is_wide_fao(con, agri_path):
+        agri = f"""
+        SELECT * FROM (
+            SELECT Area AS Country, CAST(substr(Year, 2) AS INTEGER) AS Year,
+                   Item, Element, Unit, Value
+            FROM (
+                UNPIVOT (
+                    SELECT Area, Item, Element, Unit, COLUMNS('^Y[0-9]{{4}}$')
+                    FROM {_scan(agri_path)}
+                    {where("Area", extra=item_filter + ["Element = 'Production'"])}
+                )
+                ON COLUMNS('^Y[0-9]{{4}}$') INTO NAME Year VALUE Value
+            )
+        )
+        {where(year_col="Year")}
+        """
+    else:
+        agri = f"""
+        SELECT Area AS Country, CAST(Year AS INTEGER) AS Year, Item, Element, Unit, Value
+        FROM {_scan(agri_path)}
+        {where("Area", "CAST(Year AS INTEGER)", item_filter)}
+        """
+    if aggregate_items:
+        agri = f"""
+        SELECT Country, Year, SUM(Value) AS Total_Production
+        FROM ({agri}) WHERE Element = 'Production'
+        GROUP BY Country, Year
+        """
+
+    # (2) 气候：可选按国家-年份汇总月度记录
+    climate = f"""
+    SELECT Country, CAST(Year AS INTEGER) AS Year, "Temperature (°C)", "Precipitation (mm)"
+    FROM {_scan(sources["climate"])}
+    {where("Country", "CAST(Year AS INTEGER)")}
+    """
+    if collapse_climate:
+        climate = f"""
+        SELECT Country, Year, AVG("Temperature (°C)") AS "Temperature (°C)",
+               ANY_VALUE("Precipitation (mm)") AS "Precipitation (mm)"
+        FROM ({climate}) GROUP BY Country, Year
+        """
+
+    # (3) 控制变量：ISO3 -> 国家名，缺失时用 countryname
+    mapping = " ".join(f"WHEN {_quote(k)} THEN {_quote(v)}" for k, v in iso3_to_name.items())
+    country_expr = f'COALESCE(CASE "Country Code" {mapping} END, countryname)' if mapping \
+        else "countryname"
+    control = f"""
+    SELECT * EXCLUDE ("Country Code", countryname, Year),
+           {country_expr} AS Country, CAST(Year AS INTEGER) AS Year
+    FROM {_scan(sources["control"])}
+    """
+    if countries is not None or years is not None:
+        control = f"SELECT * FROM ({control}) {where('Country', 'Year')}"
+
+    select = "*" if columns is None else ", ".join(_ident(c) for c in columns)
+    return f"""
+    WITH agri AS ({agri}),
+         climate AS ({climate}),
+         control AS ({control}),
+         climate_control AS (
+             SELECT * FROM climate INNER JOIN control USING (Country, Year)
+         )
+    SELECT {select}
+    FROM agri {how.upper()} JOIN climate_control USING (Country, Year)
+    ORDER BY Country, Year{"" if aggregate_items else ", Item"}
+    """
+
+
+def build_panel(sources, output=None, threads=None, **kwargs):
+    """
+    Run the panel query.
+
+    If `output` is given (.csv or .parquet) the result is streamed to that file
+    by DuckDB and None is returned; otherwise a pandas DataFrame is returned.
+    Other keyword arguments are passed to `panel_query`.
+    """
+    con = duckdb.connect()
+    if threads is not None:
+        con.execute(f"SET threads TO {int(threads)}")
+    sql = panel_query(sources, con=con, **kwargs)
+    if output is None:
+        return con.execute(sql).df()
+    fmt = "(FORMAT parquet)" if output.endswith(".parquet") else "(FORMAT csv, HEADER true)"
+    con.execute(f"COPY ({sql}) TO {_quote(output)} {fmt}")
+    return None
+
+
+def default_sources(data_folder):
+    """Processed cross-national inputs inside `data_folder`."""
+    return {key: os.path.join(data_folder, name) for key, name in DEFAULT_SOURCES.items()}
@@ -0,0 +1,337 @@
+"""
+Title: Incremental Report Builder
+
+Purpose:
+    Results used to be scattered: text summaries in `results/`, descriptive
+    statistics CSVs, figures in `figure/`, and interpretation text pasted into
+    script comments. This module collects them into one report,
+    `reports/report.md` and `reports/report.html`:
+
+        - descriptive statistics (cross-national and domestic)
+        - regression tables read from the result store (no refitting)
+        - the saved notebook regression output
+          (`notebooks/Domestic_study/regression_result.txt`)
+        - scenario predictions (if they have been computed)
+        - figures from `figure/`
+        - interpretation notes from `docs/report_notes/*.md`
+
+Method:
+    Each section lists its input files. A section is re-rendered only if the
+    signature of its inputs (content hash for small files, size + mtime for
+    large ones) changed since the last build; otherwise its rendered Markdown
+    and HTML are reused from `reports/.report_cache.json`. Regenerating the
+    report after a small data update only re-renders the affected sections.
+    After editing a render function, bump the section's "version" or call
+    `build_report(force=True)`.
+
+Usage:
+    python -m agriecon report
+"""
+
+import glob
+import hashlib
+import html
+import json
+import os
+from urllib.parse import quote
+
+import pandas as pd
+
+from agriecon import config
+
+REPORT_DIR = os.path.join(config.PROJECT_ROOT, "reports")
+CACHE_FILE = os.path.join(REPORT_DIR, ".report_cache.json")
+NOTES_DIR = os.path.join(config.PROJECT_ROOT, "docs", "report_notes")
+NOTEBOOK_RESULT = os.path.join(config.PROJECT_ROOT, "notebooks", "Domestic_study", "regression_result.txt")
+HASH_LIMIT = 20 * 1024 * 1024  # 超过 20 MB 的文件只比较大小与修改时间
+
+
+# ---------- 输入签名 ----------
+
+def file_signature(path):
+    if not os.path.exists(path):
+        return "missing"
+    st = os.stat(path)
+    if st.st_size > HASH_LIMIT:
+        return f"{st.st_size}:{st.st_mtime_ns}"
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def section_signature(section):
+    paths = section["inputs"]() if callable(section["inputs"]) else section["inputs"]
+    sig = hashlib.sha1()
+    sig.update(section.get("version", "1").encode("utf-8"))
+    for path in sorted(paths):
+        sig.update(f"{path}={file_signature(path)};".encode("utf-8"))
+    return sig.hexdigest()
+
+
+# ---------- 内容块 -> Markdown / HTML ----------
+
+def _fmt(value):
+    if isinstance(value, float):
+        return f"{value:.4g}" if abs(value) < 1e4 else f"{value:,.0f}"
+    return str(value)
+
+
+def markdown_table(df):
+    # 命名索引（如 Year）或非默认索引都作为第一列输出
+    if df.index.name is not None or not df.index.equals(pd.RangeIndex(len(df))):
+        df = df.reset_index().rename(columns={"index": ""})
+    header = "| " + " | ".join(map(str, df.columns)) + " |"
+    rule = "|" + "|".join("---" for _ in df.columns) + "|"
+    rows = ["| " + " | ".join(_fmt(v) for v in row) + " |" for row in df.itertuples(index=False)]
+    return "\n".join([header, rule] + rows)
+
+
+def _relative(path):
+    return quote(os.path.relpath(path, REPORT_DIR).replace(os.sep, "/"))
+
+
+def render_blocks(blocks):
+    """Turn a list of (kind, content) blocks into (markdown, html)."""
+    md, out = [], []
+    for kind, content in blocks:
+        if kind == "text":
+            md.append(content)
+            out.append(f"<p>{html.escape(content)}</p>")
+        elif kind == "subheading":
+            md.append(f"### {content}")
+            out.append(f"<h3>{html.escape(content)}</h3>")
+        elif kind == "table":
+            md.append(markdown_table(content))
+            out.append(content.to_html(float_format=_fmt, border=0, classes="table"))
+        elif kind == "pre":
+            md.append("```\n" + content + "\n```")
+            out.append(f"<pre>{html.escape(content)}</pre>")
+        elif kind == "image":
+            name = os.path.splitext(os.path.basename(content))[0]
+            md.append(f"![{name}]({_relative(content)})")
+            out.append(f'<figure><img src="{_relative(content)}" alt="{html.escape(name)}">'
+                       f"<figcaption>{html.escape(name)}</figcaption></figure>")
+        elif kind == "markdown":
+            md.append(content)
+            out.append(f"<pre class=\"note\">{html.escape(content)}</pre>")
+    return "\n\n".join(md), "\n".join(out)
+
+
+# ---------- 各节内容 ----------
+
+def _cross_descriptive():
+    blocks = []
+    for name, title in [("descriptive_stats.csv", "Summary statistics"),
+                        ("missing_rate.csv", "Missing rate by column"),
+                        ("yearly_counts.csv", "Observations per year")]:
+        path = config.cross_processed(name)
+        if os.path.exists(path):
+            blocks += [("subheading", title), ("table", pd.read_csv(path, index_col=0))]
+    if not blocks:
+        blocks.append(("text", "Run `3_descriptive statistics  .py` to create the tables."))
+    return blocks
+
+
+def _domestic_descriptive():
+    path = config.domestic_processed("descriptive_stats.csv")
+    if not os.path.exists(path):
+        return [("text", "No domestic descriptive statistics found.")]
+    return [("table", pd.read_csv(path, index_col=0))]
+
+
+def _store_inputs():
+    from agriecon.results_store import INDEX_FILE, STORE_DIR
+    paths = [INDEX_FILE]
+    if os.path.exists(INDEX_FILE):
+        with open(INDEX_FILE, encoding="utf-8") as f:
+            paths += [os.path.join(STORE_DIR, f"{key}.npz") for key in json.load(f).values()]
+    return paths
+
+
+def _regressions():
+    from agriecon.results_store import INDEX_FILE, load_result
+    if not os.path.exists(INDEX_FILE):
+        return [("text", "No stored regression results yet (run the regression stages).")]
+    with open(INDEX_FILE, encoding="utf-8") as f:
+        labels = sorted(json.load(f))
+
+    blocks = []
+    for label in labels:
+        res = load_result(label)
+        if res is None:
+            continue
+        meta = res["meta"]
+        table = pd.DataFrame({
+            "coef": res["params"], "std err": res["bse"],
+            "t": res["tvalues"], "p": res["pvalues"],
+        })
+        # 固定效应虚拟变量不列出
+        table = table[~table.index.str.startswith("C(")]
+        stats = ", ".join(f"{k} = {_fmt(v)}" for k, v in res["stats"].items())
+        cov = " ".join([meta["cov_type"]] + [f"{k}={v}" for k, v in meta["cov_kwds"].items()])
+        blocks += [
+            ("subheading", f"{label}: {meta['formula']}"),
+            ("text", f"Fixed effects: {', '.join(meta['fe']) or 'none'}; "
+                     f"covariance: {cov}; {stats}"),
+            ("table", table),
+        ]
+    return blocks
+
+
+def _notebook_result():
+    if not os.path.exists(NOTEBOOK_RESULT):
+        return [("text", "No saved notebook regression output.")]
+    with open(NOTEBOOK_RESULT, encoding="utf-8") as f:
+        text = f.read().rstrip()
+    return [
+        ("text", "Year fixed-effect OLS saved by `notebooks/Domestic_study/Domestic Studies.ipynb` "
+                 "(kept as written; not refitted)."),
+        ("pre", text),
+    ]
+
+
+def _scenarios():
+    path = config.domestic_processed("scenario_yield_predictions.csv")
+    if not os.path.exists(path):
+        return [("text", "Run the `scenarios` stage to add predicted yields under warming.")]
+    pred = pd.read_csv(path)
+    table = pred.groupby(["scenario_shift", "province"])[
+        ["Annual_GDD", "pred_yield", "pred_yield_lower", "pred_yield_upper"]
+    ].mean().round(2)
+    return [("text", "Mean over crops and years."), ("table", table)]
+
+
+def _figures():
+    paths = sorted(glob.glob(os.path.join(config.FIGURE_DIR, "**", "*.png"), recursive=True))
+    blocks = []
+    for folder in dict.fromkeys(os.path.dirname(p) for p in paths):
+        blocks.append(("subheading", os.path.basename(folder)))
+        blocks += [("image", p) for p in paths if os.path.dirname(p) == folder]
+    return blocks
+
+
+def _notes():
+    blocks = []
+    for path in sorted(glob.glob(os.path.join(NOTES_DIR, "*.md"))):
+        with open(path, encoding="utf-8") as f:
+            blocks.append(("markdown", f.read().strip()))
+    return blocks
+
+
+SECTIONS = [
+    {
+        "name": "cross_descriptive",
+        "title": "Cross-national study: descriptive statistics",
+        "inputs": [config.cross_processed(n) for n in
+                   ("descriptive_stats.csv", "missing_rate.csv", "yearly_counts.csv")],
+        "render": _cross_descriptive,
+    },
+    {
+        "name": "domestic_descriptive",
+        "title": "Domestic study: descriptive statistics",
+        "inputs": [config.domestic_processed("descriptive_stats.csv")],
+        "render": _domestic_descriptive,
+    },
+    {
+        "name": "regressions",
+        "title": "Regression results",
+        "inputs": _store_inputs,
+        "render": _regressions,
+    },
+    {
+        "name": "notebook_regression",
+        "title": "Notebook regression output",
+        "inputs": [NOTEBOOK_RESULT],
+        "render": _notebook_result,
+    },
+    {
+        "name": "scenarios",
+        "title": "Predicted yields under warming scenarios",
+        "inputs": [config.domestic_processed("scenario_yield_predictions.csv")],
+        "render": _scenarios,
+    },
+    {
+        "name": "figures",
+        "title": "Figures",
+        "inputs": lambda: glob.glob(os.path.join(config.FIGURE_DIR, "**", "*.png"), recursive=True),
+        "render": _figures,
+    },
+    {
+        "name": "notes",
+        "title": "Interpretation",
+        "inputs": lambda: glob.glob(os.path.join(NOTES_DIR, "*.md")),
+        "render": _notes,
+    },
+]
+
+
+# ---------- 组装 ----------
+
+HTML_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: sans-serif; max-width: 1000px; margin: 2em auto; }}
+table.table {{ border-collapse: collapse; font-size: 0.9em; }}
+table.table td, table.table th {{ padding: 2px 8px; text-align: right; }}
+img {{ max-width: 100%; }}
+pre {{ background: #f6f6f6; padding: 0.8em; white-space: pre-wrap; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+{body}
+</body>
+</html>
+"""
+
+
+def _load_cache():
+    if not os.path.exists(CACHE_FILE):
+        return {}
+    with open(CACHE_FILE, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_if_changed(path, text):
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            if f.read() == text:
+                return
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def build_report(sections=SECTIONS, title="GRASPP 2025 AgriEcon: Climate and Agriculture",
+                 force=False):
+    """
+    Build reports/report.md and reports/report.html, re-rendering only the
+    sections whose inputs changed. Returns the names of the rebuilt sections.
+    """
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    cache = {} if force else _load_cache()
+    rebuilt, md_parts, html_parts = [], [f"# {title}"], []
+
+    for section in sections:
+        sig = section_signature(section)
+        entry = cache.get(section["name"])
+        if entry is None or entry["signature"] != sig:
+            md, body = render_blocks(section["render"]())
+            entry = {"signature": sig, "md": md, "html": body}
+            cache[section["name"]] = entry
+            rebuilt.append(section["name"])
+        md_parts.append(f"## {section['title']}\n\n{entry['md']}")
+        html_parts.append(f"<section><h2>{html.escape(section['title'])}</h2>\n{entry['html']}</section>")
+
+    _write_if_changed(os.path.join(REPORT_DIR, "report.md"), "\n\n".join(md_parts) + "\n")
+    _write_if_changed(os.path.join(REPORT_DIR, "report.html"),
+                      HTML_TEMPLATE.format(title=html.escape(title), body="\n".join(html_parts)))
+    with open(CACHE_FILE, "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False)
+    return rebuilt
+
+
+if __name__ == "__main__":
+    names = build_report()
+    print(f"Report written to {REPORT_DIR} (rebuilt: {', '.join(names) or 'nothing'})")
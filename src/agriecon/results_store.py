@@ -0,0 +1,211 @@
+"""
+Title: Cached Model-Result Store
+
+Purpose:
+    The regression scripts refit their models on every run and only keep a
+    text dump of `summary()`. This module stores the structured result of each
+    fit (coefficients, standard errors, t / p values, the full covariance
+    matrix and the fit statistics) in a binary `.npz` file under
+    `results/store/`, keyed by a fingerprint of:
+
+        - the data (hash of the rows and columns passed to the model)
+        - the formula
+        - the fixed-effect set
+        - the covariance type (and its options)
+        - the estimator version (`STORE_VERSION` plus an optional `estimator`
+          tag, e.g. `spatial_hac.ESTIMATOR_VERSION`), so results computed by
+          older code are refitted instead of served from the store
+
+    If a model with the same fingerprint was already fitted, the stored result
+    is returned without refitting. Plots, dashboards and report tables can read
+    the latest result of a model by its label with `load_result(label)`.
+
+    Example:
+        res = cached_fit(df, "log_yield ~ Annual_GDD + C(year)",
+                         fit=lambda: smf.ols(formula, data=df).fit(),
+                         label="modelC", fe=["year"], cov_type="nonrobust")
+        res["params"]["Annual_GDD"], res["vcov"], res["stats"]["r2"]
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from agriecon import config
+
+# 结果提取或估计方法改变时加一，旧的缓存结果随之失效
+STORE_VERSION = 2
+STORE_DIR = os.path.join(config.RESULTS_DIR, "store")
+INDEX_FILE = os.path.join(STORE_DIR, "index.json")
+
+STAT_ATTRS = {
+    "nobs": "nobs",
+    "r2": "rsquared",
+    "r2_adj": "rsquared_adj",
+    "fvalue": "fvalue",
+    "f_pvalue": "f_pvalue",
+    "aic": "aic",
+    "bic": "bic",
+    "df_resid": "df_resid",
+    "loglik": "llf",
+}
+
+
+def data_hash(df):
+    """Hash of the DataFrame content (values, column names and dtypes)."""
+    h = hashlib.sha256()
+    h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    h.update(json.dumps([[str(c), str(t)] for c, t in df.dtypes.items()]).encode("utf-8"))
+    return h.hexdigest()
+
+
+def fingerprint(df, formula, fe=(), cov_type="nonrobust", cov_kwds=None, estimator=None):
+    """Fingerprint of one model fit."""
+    spec = {
+        "store_version": STORE_VERSION,
+        "estimator": estimator,
+        "data": data_hash(df),
+        "formula": formula,
+        "fe": sorted(fe),
+        "cov_type": cov_type,
+        "cov_kwds": cov_kwds or {},
+    }
+    text = json.dumps(spec, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:20]
+
+
+def extract_result(res):
+    """Structured parts of a statsmodels or linearmodels result."""
+    params = pd.Series(res.params)
+    bse = getattr(res, "std_errors", None)
+    if bse is None:
+        bse = res.bse
+    tvalues = getattr(res, "tstats", None)
+    if tvalues is None:
+        tvalues = res.tvalues
+    vcov = res.cov if hasattr(res, "cov") and not callable(res.cov) else res.cov_params()
+
+    stats = {}
+    for key, attr in STAT_ATTRS.items():
+        try:
+            value = getattr(res, attr)
+        except (AttributeError, ValueError, NotImplementedError):
+            continue
+        if np.isscalar(value) and value is not None:
+            stats[key] = float(value)
+
+    summary = res.summary
+    summary = summary() if callable(summary) else summary
+    return {
+        "params": params,
+        "bse": pd.Series(bse, index=params.index),
+        "tvalues": pd.Series(tvalues, index=params.index),
+        "pvalues": pd.Series(res.pvalues, index=params.index),
+        "vcov": pd.DataFrame(vcov, index=params.index, columns=params.index),
+        "stats": stats,
+        "summary": summary.as_text() if hasattr(summary, "as_text") else str(summary),
+    }
+
+
+def save_result(key, result, meta):
+    """Write one result to `results/store/<key>.npz`."""
+    os.makedirs(STORE_DIR, exist_ok=True)
+    names = np.array([str(n) for n in result["params"].index], dtype=str)
+    np.savez_compressed(
+        os.path.join(STORE_DIR, f"{key}.npz"),
+        names=names,
+        params=result["params"].to_numpy(dtype=float),
+        bse=result["bse"].to_numpy(dtype=float),
+        tvalues=result["tvalues"].to_numpy(dtype=float),
+        pvalues=result["pvalues"].to_numpy(dtype=float),
+        vcov=result["vcov"].to_numpy(dtype=float),
+        stats=json.dumps(result["stats"]),
+        summary=result["summary"],
+        meta=json.dumps(meta, default=str),
+    )
+
+
+def read_result(key):
+    """Read one stored result by fingerprint; None if it does not exist."""
+    path = os.path.join(STORE_DIR, f"{key}.npz")
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as data:
+        names = data["names"].tolist()
+        result = {
+            name: pd.Series(data[name], index=names)
+            for name in ("params", "bse", "tvalues", "pvalues")
+        }
+        result["vcov"] = pd.DataFrame(data["vcov"], index=names, columns=names)
+        result["stats"] = json.loads(str(data["stats"]))
+        result["summary"] = str(data["summary"])
+        result["meta"] = json.loads(str(data["meta"]))
+    return result
+
+
+def _read_index():
+    if not os.path.exists(INDEX_FILE):
+        return {}
+    with open(INDEX_FILE, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_index(index):
+    os.makedirs(STORE_DIR, exist_ok=True)
+    with open(INDEX_FILE, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2, ensure_ascii=False)
+
+
+def load_result(label):
+    """Latest stored result for a model label (e.g. "modelC"); None if never fitted."""
+    key = _read_index().get(label)
+    return read_result(key) if key else None
+
+
+def cached_fit(df, formula, fit, label=None, fe=(), cov_type="nonrobust", cov_kwds=None,
+               estimator=None):
+    """
+    Return the stored result for this fingerprint, or call `fit()` and store it.
+
+    Parameters:
+        df: the exact data passed to the model (used for the data hash)
+        formula: model formula
+        fit: function with no arguments returning a fitted statsmodels /
+            linearmodels result; only called on a cache miss
+        label: optional name under which the latest result is indexed
+        fe, cov_type, cov_kwds: fixed-effect set and covariance settings
+        estimator: version tag of the code computing the result (e.g.
+            `spatial_hac.ESTIMATOR_VERSION`); change it to invalidate old results
+
+    Returns:
+        dict with params, bse, tvalues, pvalues (Series), vcov (DataFrame),
+        stats (dict), summary (text), meta (dict) and cached (bool)
+    """
+    key = fingerprint(df, formula, fe, cov_type, cov_kwds, estimator)
+    result = read_result(key)
+    cached = result is not None
+    if not cached:
+        meta = {
+            "label": label,
+            "formula": formula,
+            "fe": list(fe),
+            "cov_type": cov_type,
+            "cov_kwds": cov_kwds or {},
+            "estimator": estimator,
+            "store_version": STORE_VERSION,
+            "n_rows": len(df),
+            "fingerprint": key,
+        }
+        result = extract_result(fit())
+        save_result(key, result, meta)
+        result["meta"] = meta
+    if label is not None:
+        index = _read_index()
+        if index.get(label) != key:
+            index[label] = key
+            _write_index(index)
+    result["cached"] = cached
+    return result
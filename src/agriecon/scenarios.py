@@ -0,0 +1,171 @@
+"""
+Title: Yield Predictions under Climate Scenarios
+
+Purpose:
+    Score a fitted GDD model on many warming scenarios at once. Each scenario
+    shifts the daily NASA POWER temperatures (e.g. +1 / +2 / +3 °C), GDD is
+    recomputed from the shifted daily series, and predicted yields are produced
+    for every province x crop x year x scenario, with uncertainty bands from
+    the coefficient covariance matrix.
+
+Method:
+    - Daily mean temperatures are loaded once into an array of shape
+      (city, year, day); NASA -999 values become NaN.
+    - Scenario GDD is one broadcast expression:
+          GDD[s, c, y] = sum_d max(0, Tmean[c, y, d] + shift[s] - T_BASE)
+    - The design matrix is built from the stored parameter names
+      ("Intercept", "Annual_GDD", "C(year)[T.2010]", ...), so a result from
+      `agriecon.results_store` can be scored without refitting.
+    - Columns that do not change across scenarios (fixed effects) are
+      multiplied once; only the climate columns are scored per scenario:
+          pred[s, n] = X_fixed[n] @ b_fixed + Z[s, n] @ b_climate
+    - Bands: "analytic" uses the exact variance x' V x of the linear
+      predictor (t critical value when df_resid is stored); "draws" samples
+      coefficients from N(b, V) and takes quantiles, a block of scenarios at
+      a time so memory stays bounded by DRAW_BLOCK. Predictions are on the
+      model scale (log yield) and also returned as yields via exp().
+"""
+
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from agriecon import config
+
+_CATEGORICAL = re.compile(r"^C\((?P<var>[^)]+)\)\[T\.(?P<level>.+)\]$")
+NASA_MISSING = -999
+# draws 方法每块模拟张量的最大元素数（约 128 MB float64）
+DRAW_BLOCK = 2 ** 24
+
+
+def load_daily_tmean(input_dir=config.NASA_RAW_DIR, cities=None,
+                     start_year=config.START_YEAR, end_year=config.END_YEAR):
+    """
+    Daily mean temperature (T2M_MAX + T2M_MIN) / 2 as a (city, year, day) array.
+
+    Returns:
+        dict with "tmean" (float array, NaN padded to 366 days), "cities", "years"
+    """
+    cities = list(cities or config.CITIES)
+    years = np.arange(start_year, end_year + 1)
+    tmean = np.full((len(cities), len(years), 366), np.nan)
+    for i, city in enumerate(cities):
+        for j, year in enumerate(years):
+            path = os.path.join(input_dir, f"{city}_{year}.csv")
+            if not os.path.exists(path):
+                continue
+            df = pd.read_csv(path, skiprows=10)  # 跳过前10行metadata
+            t = df[["T2M_MAX", "T2M_MIN"]].to_numpy(dtype=float)
+            t[t == NASA_MISSING] = np.nan
+            tmean[i, j, :len(t)] = t.mean(axis=1)
+    return {"tmean": tmean, "cities": cities, "years": years}
+
+
+def scenario_gdd(tmean, shifts, t_base=config.T_BASE):
+    """GDD for every scenario shift, shape (scenario, city, year)."""
+    shifts = np.asarray(shifts, dtype=float)
+    shifted = tmean[None, ...] + shifts[:, None, None, None]
+    return np.nansum(np.clip(shifted - t_base, 0, None), axis=-1)
+
+
+def design_matrix(names, frame):
+    """
+    Design matrix for the given parameter names.
+
+    Supports "Intercept", numeric columns and treatment dummies "C(var)[T.level]".
+    Rows with the reference level of a categorical get zeros in all its dummies.
+    """
+    X = np.zeros((len(frame), len(names)))
+    for k, name in enumerate(names):
+        match = _CATEGORICAL.match(name)
+        if name == "Intercept":
+            X[:, k] = 1.0
+        elif match:
+            col = frame[match["var"]]
+            X[:, k] = (col.astype(str) == match["level"]).to_numpy()
+        elif name in frame.columns:
+            X[:, k] = frame[name].to_numpy(dtype=float)
+        else:
+            raise ValueError(f"Cannot build design column for parameter '{name}'")
+    return X
+
+
+def score_scenarios(result, frame, climate, method="analytic", level=0.95,
+                    n_draws=1000, seed=0):
+    """
+    Predict the model for every row of `frame` under every scenario.
+
+    Parameters:
+        result: dict with "params" (Series) and "vcov" (DataFrame), e.g. from
+            `results_store.load_result`
+        frame: one row per unit to score (province, crop, year, ...)
+        climate: dict column name -> array of shape (scenario, len(frame));
+            these columns replace the frame values for each scenario
+        method: "analytic" or "draws"
+        level: width of the band
+
+    Returns:
+        dict with "pred", "lower", "upper", each of shape (scenario, len(frame))
+    """
+    names = list(result["params"].index)
+    beta = result["params"].to_numpy(dtype=float)
+    V = result["vcov"].loc[names, names].to_numpy(dtype=float)
+
+    clim_idx = [names.index(c) for c in climate]
+    fixed_idx = [k for k in range(len(names)) if k not in clim_idx]
+    fixed_frame = frame.drop(columns=list(climate), errors="ignore")
+    X_fixed = design_matrix([names[k] for k in fixed_idx], fixed_frame)
+    Z = np.stack([np.asarray(climate[c], dtype=float) for c in climate], axis=-1)  # (S, N, Kc)
+
+    pred = (X_fixed @ beta[fixed_idx])[None, :] + Z @ beta[clim_idx]
+    alpha = (1 - level) / 2
+
+    if method == "analytic":
+        from scipy import stats
+        # x' V x，分成固定部分与气候部分避免构造 (S, N, K) 的完整设计张量
+        Vff = V[np.ix_(fixed_idx, fixed_idx)]
+        Vfc = V[np.ix_(fixed_idx, clim_idx)]
+        Vcc = V[np.ix_(clim_idx, clim_idx)]
+        var = (
+            np.einsum("nk,kl,nl->n", X_fixed, Vff, X_fixed)[None, :]
+            + 2 * np.einsum("nk,kl,snl->sn", X_fixed, Vfc, Z)
+            + np.einsum("snk,kl,snl->sn", Z, Vcc, Z)
+        )
+        df_resid = result.get("stats", {}).get("df_resid")
+        crit = stats.t.ppf(1 - alpha, df_resid) if df_resid else stats.norm.ppf(1 - alpha)
+        half = crit * np.sqrt(np.clip(var, 0, None))
+        lower, upper = pred - half, pred + half
+    elif method == "draws":
+        rng = np.random.default_rng(seed)
+        draws = rng.multivariate_normal(beta, V, size=n_draws, method="eigh")  # (D, K)
+        base = X_fixed @ draws[:, fixed_idx].T                                # (N, D)
+        clim_draws = draws[:, clim_idx].T                                     # (Kc, D)
+        lower, upper = np.empty_like(pred), np.empty_like(pred)
+        # 按情景分块，避免一次构造 (S, N, D) 的完整模拟张量
+        step = max(1, DRAW_BLOCK // (base.size or 1))
+        for s0 in range(0, len(pred), step):
+            sims = base[None, :, :] + Z[s0:s0 + step] @ clim_draws           # (s, N, D)
+            lower[s0:s0 + step], upper[s0:s0 + step] = np.quantile(
+                sims, [alpha, 1 - alpha], axis=-1)
+    else:
+        raise ValueError(f"Unknown method: {method}")
+
+    return {"pred": pred, "lower": lower, "upper": upper}
+
+
+def scenario_frame(frame, shifts, climate, scored):
+    """Long DataFrame: one row per scenario x frame row, with log and level predictions."""
+    n_scen, n_rows = scored["pred"].shape
+    out = frame.iloc[np.tile(np.arange(n_rows), n_scen)].reset_index(drop=True)
+    out.insert(0, "scenario_shift", np.repeat(np.asarray(shifts, dtype=float), n_rows))
+    for col, values in climate.items():
+        out[col] = np.asarray(values).reshape(-1)
+    out["pred_log"] = scored["pred"].reshape(-1)
+    out["pred_log_lower"] = scored["lower"].reshape(-1)
+    out["pred_log_upper"] = scored["upper"].reshape(-1)
+    out["pred_yield"] = np.exp(out["pred_log"])
+    out["pred_yield_lower"] = np.exp(out["pred_log_lower"])
+    out["pred_yield_upper"] = np.exp(out["pred_log_upper"])
+    return out
@@ -0,0 +1,157 @@
+"""
+Title: Vectorized Variable Transforms and Sample Selection
+
+Purpose:
+    Every regression script prepares its variables the same way: drop rows with
+    missing values, drop rows that cannot be logged (value <= 0), then create
+    log / standardized / lagged / differenced columns. This module does that in
+    one place from a declarative list of transforms.
+
+    Example:
+        TRANSFORMS = [
+            {"op": "log", "column": "value", "name": "log_yield"},
+            {"op": "standardize", "column": "Annual_GDD", "name": "z_gdd"},
+            {"op": "lag", "column": "Annual_GDD", "k": 1},
+        ]
+        df, audit = apply_transforms(df, TRANSFORMS, required=["Annual_GDD"],
+                                     entity="province", time="year")
+
+Method:
+    - All selection rules (not missing, positive for every logged column) are
+      evaluated as one boolean matrix over the selected columns; a row is kept
+      only if it passes every rule.
+    - Every op of the same kind is applied to all its columns at once as a
+      single NumPy expression, not row by row.
+    - Lags, leads and differences are taken on the full panel sorted by
+      (entity, time), before the selection rules are applied, so a row that is
+      dropped (e.g. last year's yield <= 0) still provides its lagged value to
+      the next year. A lagged value is only used when it belongs to the same
+      entity and is exactly k periods earlier; missing years give NaN.
+    - The audit table records, for each rule, how many rows fail it and how many
+      rows it removes after the earlier rules have been applied (same order as
+      the old filter-one-variable-at-a-time loop).
+"""
+
+import numpy as np
+import pandas as pd
+
+from agriecon.features import shift_within
+
+OPS = ("log", "standardize", "lag", "lead", "diff")
+
+DEFAULT_PREFIX = {
+    "log": "log_",
+    "standardize": "z_",
+    "lag": "lag{k}_",
+    "lead": "lead{k}_",
+    "diff": "d{k}_",
+}
+
+
+def output_name(spec):
+    """Name of the new column created by one transform spec."""
+    if spec.get("name"):
+        return spec["name"]
+    prefix = DEFAULT_PREFIX[spec["op"]].format(k=spec.get("k", 1))
+    return prefix + spec["column"]
+
+
+def selection_rules(transforms, required=None):
+    """List of (rule, column) pairs implied by the transforms."""
+    rules = [("notna", col) for col in (required or [])]
+    rules += [("positive", s["column"]) for s in transforms if s["op"] == "log"]
+    # 去重但保留顺序
+    return list(dict.fromkeys(rules))
+
+
+def apply_transforms(df, transforms, required=None, entity=None, time=None):
+    """
+    Apply selection rules and transforms to a DataFrame.
+
+    Parameters:
+        df: input DataFrame (not modified)
+        transforms: list of dicts with keys "op", "column" and optionally
+            "name" and "k" (for lag / lead / diff, default 1)
+        required: extra columns that must be non-missing
+        entity, time: panel keys, needed for lag / lead / diff; entity may be
+            one column or a list of columns (e.g. ["province", "指标"])
+
+    Returns:
+        (DataFrame with the kept rows and the new columns, audit DataFrame)
+    """
+    for spec in transforms:
+        if spec["op"] not in OPS:
+            raise ValueError(f"Unknown transform op: {spec['op']}")
+        if spec["op"] in ("lag", "lead", "diff") and (entity is None or time is None):
+            raise ValueError(f"'{spec['op']}' needs both entity and time")
+
+    rules = selection_rules(transforms, required)
+    rule_cols = list(dict.fromkeys(col for _, col in rules))
+    block = df[rule_cols].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+
+    # 一次性计算所有规则的布尔矩阵
+    col_idx = [rule_cols.index(col) for _, col in rules]
+    checked = block[:, col_idx]
+    positive = np.array([rule == "positive" for rule, _ in rules], dtype=bool)
+    passes = ~np.isnan(checked) & (~positive | (checked > 0))
+
+    # 样本筛选审计：按规则顺序累计剔除
+    kept_before = np.logical_and.accumulate(
+        np.column_stack([np.ones((len(df), 1), dtype=bool), passes[:, :-1]]), axis=1
+    )[:, :len(rules)]
+    n_failed = (~passes).sum(axis=0)
+    n_dropped = (kept_before & ~passes).sum(axis=0)
+    audit = pd.DataFrame({
+        "rule": [rule for rule, _ in rules],
+        "column": [col for _, col in rules],
+        "n_failed": n_failed.astype(int),
+        "n_dropped": n_dropped.astype(int),
+    })
+    audit["n_remaining"] = len(df) - audit["n_dropped"].cumsum()
+
+    keep = passes.all(axis=1)
+    panel = df
+    if entity is not None and time is not None:
+        entity = [entity] if isinstance(entity, str) else list(entity)
+        order = df.reset_index(drop=True).sort_values(entity + [time], kind="stable").index
+        panel, keep = df.iloc[order], keep[order]
+    out = panel.loc[keep].copy()
+
+    new_cols = {}
+    for op in OPS:
+        specs = [s for s in transforms if s["op"] == op]
+        if not specs:
+            continue
+        names = [output_name(s) for s in specs]
+        columns = [s["column"] for s in specs]
+
+        if op == "log":
+            result = np.log(out[columns].to_numpy(dtype=float))
+        elif op == "standardize":
+            values = out[columns].to_numpy(dtype=float)
+            result = (values - np.nanmean(values, axis=0)) / np.nanstd(values, axis=0, ddof=1)
+        else:
+            # 在筛选前的完整面板上平移，再取保留的行
+            values = panel[columns].to_numpy(dtype=float)
+            codes = panel.groupby(entity, sort=False).ngroup().to_numpy()
+            t = panel[time].to_numpy()
+            ks = np.array([s.get("k", 1) for s in specs])
+            result = np.empty_like(values)
+            # 同一 k 的列一起平移
+            for k in np.unique(ks):
+                cols = ks == k
+                shift = -k if op == "lead" else k
+                shifted = shift_within(values[:, cols], codes, t, shift)
+                result[:, cols] = values[:, cols] - shifted if op == "diff" else shifted
+            result = result[keep]
+
+        new_cols.update(dict(zip(names, result.T)))
+
+    out = out.assign(**new_cols)
+    return out, audit
+
+
+def print_audit(audit, label="Sample selection"):
+    """Print the sample-selection audit in a compact form."""
+    print(f"\n[{label}]")
+    print(audit.to_string(index=False))
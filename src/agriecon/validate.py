@@ -0,0 +1,161 @@
+"""
+Title: Input Validation and Schema Checks
+
+Purpose:
+    Bad inputs used to surface deep in the pipeline or not at all: NASA -999
+    sentinels, the BOM in front of the `指标` header of the yield CSVs,
+    province-years without GDD after the left merge, and FAO country names
+    that do not match the ISO3 codes of the control variables. The checks
+    below run on whole columns at once (no row loops), so they are cheap
+    enough to run on every execution, right before a table is written or a
+    model is fitted.
+
+    Every check returns diagnostics rows of the form
+        {"check", "target", "n_bad", "n_rows", "level", "detail"}
+    and `validate()` collects them, prints a compact report and raises
+    ValueError if any "error" level check failed.
+
+    Example:
+        validate([
+            check_schema(panel, {"province": "str", "year": "int", "value": "float"}),
+            check_unique(panel, ["province", "year", "指标"]),
+            check_range(panel, "Annual_GDD", 0, 6000),
+        ], label="panel_yield_gdd")
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+BOM_BYTES = b"\xef\xbb\xbf"
+SENTINELS = (-999,)
+
+_KINDS = {
+    "int": pd.api.types.is_integer_dtype,
+    "float": pd.api.types.is_numeric_dtype,
+    "numeric": pd.api.types.is_numeric_dtype,
+    "str": lambda s: pd.api.types.is_string_dtype(s) or pd.api.types.is_object_dtype(s),
+}
+
+
+def _row(check, target, n_bad, n_rows, level="error", detail=""):
+    return {
+        "check": check,
+        "target": target,
+        "n_bad": int(n_bad),
+        "n_rows": int(n_rows),
+        "level": level if n_bad else "ok",
+        "detail": detail if n_bad else "",
+    }
+
+
+def _examples(values, n=3):
+    values = list(dict.fromkeys(map(str, values)))
+    more = f" (+{len(values) - n} more)" if len(values) > n else ""
+    return ", ".join(values[:n]) + more
+
+
+def check_bom(paths, level="warn"):
+    """
+    Raw files that start with a UTF-8 BOM (EF BB BF).
+
+    Checked on the first bytes of each file: `pd.read_csv` already drops the
+    BOM, so it cannot be seen in the column names of the loaded DataFrame.
+    """
+    paths = list(paths)
+    bad = []
+    for path in paths:
+        with open(path, "rb") as f:
+            if f.read(len(BOM_BYTES)) == BOM_BYTES:
+                bad.append(os.path.basename(path))
+    return [_row("bom_header", "files", len(bad), len(paths), level,
+                 f"UTF-8 BOM at start of: {_examples(bad)}")]
+
+
+def check_schema(df, schema):
+    """Columns exist and have the expected kind ("int", "float", "numeric", "str")."""
+    rows = []
+    for col, kind in schema.items():
+        if col not in df.columns:
+            rows.append(_row("schema", col, 1, 1, "error", "missing column"))
+            continue
+        ok = _KINDS[kind](df[col])
+        rows.append(_row("schema", col, 0 if ok else 1, 1, "error",
+                         f"expected {kind}, got {df[col].dtype}"))
+    return rows
+
+
+def check_sentinels(df, columns, sentinels=SENTINELS, level="error"):
+    """Numeric missing-value codes such as NASA's -999."""
+    block = df[list(columns)].to_numpy(dtype=float)
+    bad = np.isin(block, sentinels)
+    return [
+        _row("sentinel", col, n, len(df), level, f"values in {list(sentinels)}")
+        for col, n in zip(columns, bad.sum(axis=0))
+    ]
+
+
+def check_missing(df, columns, level="warn"):
+    counts = df[list(columns)].isna().sum()
+    return [_row("missing", col, n, len(df), level, f"{n / max(len(df), 1):.1%} missing")
+            for col, n in counts.items()]
+
+
+def check_unique(df, keys):
+    dup = df.duplicated(subset=list(keys), keep=False)
+    examples = df.loc[dup, list(keys)].drop_duplicates().head(3).to_numpy().tolist()
+    return [_row("unique_keys", "+".join(keys), dup.sum(), len(df), "error",
+                 f"duplicated keys, e.g. {examples}")]
+
+
+def check_range(df, column, low=None, high=None, level="error"):
+    """Non-missing values outside [low, high]."""
+    x = df[column].to_numpy(dtype=float)
+    bad = np.zeros(len(x), dtype=bool)
+    if low is not None:
+        bad |= x < low
+    if high is not None:
+        bad |= x > high
+    detail = f"outside [{low}, {high}], e.g. {_examples(x[bad])}"
+    return [_row("range", column, bad.sum(), len(df), level, detail)]
+
+
+def check_coverage(left, right, left_on, right_on=None, level="error", min_share=1.0):
+    """
+    Share of `left` keys that have a match in `right` (anti-join count).
+
+    Use before a merge to catch key mismatches such as FAO names vs ISO3 codes,
+    or province-years without GDD.
+    """
+    right_on = right_on or left_on
+    left_keys = pd.MultiIndex.from_frame(left[list(left_on)].astype(str))
+    right_keys = pd.MultiIndex.from_frame(right[list(right_on)].astype(str))
+    matched = left_keys.isin(right_keys)
+    n_bad = (~matched).sum()
+    share = matched.mean() if len(matched) else 1.0
+    missing = left_keys[~matched].unique()
+    row = _row("join_coverage", f"{'+'.join(left_on)} -> {'+'.join(right_on)}",
+               n_bad if share < min_share else 0, len(left), level,
+               f"{share:.1%} matched; unmatched keys e.g. {_examples(missing)}")
+    return [row]
+
+
+def validate(checks, label="validation", raise_on_error=True, verbose=True):
+    """
+    Collect diagnostics from a list of checks, print a compact report and
+    raise ValueError if any error-level check failed.
+    """
+    rows = [row for rows in checks for row in rows]
+    report = pd.DataFrame(rows, columns=["check", "target", "n_bad", "n_rows", "level", "detail"])
+    failed = report[report["level"] != "ok"]
+    if verbose:
+        n_ok = len(report) - len(failed)
+        print(f"[{label}] {n_ok}/{len(report)} checks passed")
+        if len(failed):
+            print(failed.to_string(index=False))
+    errors = failed[failed["level"] == "error"]
+    if raise_on_error and len(errors):
+        names = ", ".join(f"{c}:{t}" for c, t in zip(errors["check"], errors["target"]))
+        raise ValueError(f"[{label}] validation failed: {names}")
+    return report
@@ -1,11 +1,14 @@
 import pandas as pd
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from agriecon import config
 
 # step1: agricultural_production_data(FAO)
 
-data_folder = '../../data/raw/cross-national study/Agricultural Production_FAO'
-df = pd.read_csv(f"{data_folder}/Agricultural Production_FAO/Production_Crops_Livestock_E_All_Data_NOFLAG.csv")
-target_countries = ["Japan", "Germany", "Spain", "Italy"]
+df = pd.read_csv(config.FAO_PRODUCTION_FILE)
+target_countries = config.TARGET_COUNTRIES
 df = df[df["Area"].isin(target_countries)]
 df = df[df["Element"] == "Production"]
 df = df[[col for col in df.columns if "Code" not in col]]
@@ -21,18 +24,13 @@ df_long = df.melt(
 )
 
 df_long["Year"] = df_long["Year"].str.extract(r"(\d{4})")
-df_long.to_csv("agricultural_production_data_LongPanel.csv", index=False)
+df_long.to_csv(config.cross_processed("agricultural_production_data_LongPanel.csv"), index=False)
 
 
 # step2: climate_data (OWID)
 
-import pandas as pd
-import os
-
-data_folder = '../../data/raw/cross-national study/climate_data _OWID/climate_data _OWID/monthly-average-surface-temperatures-by-year'
-temp_df = pd.read_csv(f"{data_folder}/monthly-average-surface-temperatures-by-year.csv")
+temp_df = pd.read_csv(config.OWID_MONTHLY_TEMPERATURE_FILE)
 temp_df.head(2)
-target_countries = ["Japan", "Germany", "Spain", "Italy"]
 temp_df = temp_df[temp_df["Entity"].isin(target_countries)]
 
 non_year_cols = ["Entity", "Code", "Year"]
@@ -44,7 +42,7 @@ temp_long = temp_df.melt(
     value_name="Temperature (°C)"
 )
 temp_long["Year"] = temp_long["Year"].astype(int)
-precip_df = pd.read_csv("average-precipitation-per-year.csv")
+precip_df = pd.read_csv(config.OWID_PRECIPITATION_FILE)
 precip_df = precip_df[precip_df["Entity"].isin(target_countries)]
 precip_df = precip_df.rename(columns={"Annual precipitation": "Precipitation (mm)"})
 precip_df = precip_df[["Entity", "Year", "Precipitation (mm)"]]
@@ -52,15 +50,25 @@ merged = pd.merge(temp_long, precip_df, on=["Entity", "Year"])
 merged = merged.rename(columns={"Entity": "Country"})
 merged = merged[["Country", "Year", "Temperature (°C)", "Precipitation (mm)"]]
 merged = merged.sort_values(by=["Country", "Year"])
-merged.to_csv("climate_data.csv", index=False)
+merged.to_csv(config.cross_processed("climate_data.csv"), index=False)
+
+# Keep the monthly structure as a (country x year x month) float32 cube and
+# cache the growing-season / anomaly / exposure features for the regressions
+from agriecon.climate import cached_climate_features
+
+climate_features = cached_climate_features(
+    config.OWID_MONTHLY_TEMPERATURE_FILE,
+    config.cross_processed("climate_monthly_cube.npz"),
+    config.cross_processed("climate_features.csv"),
+    countries=target_countries,
+)
 
 
 # step3: control_variables (global_macro_data)
 
 from global_macro_data import gmd
-import pandas as pd
 
-countries = ["JPN", "DEU", "ESP", "ITA"]
+countries = config.TARGET_ISO3
 
 variables = [
     "rGDP_pc", "nGDP", "pop", "urban", "infl",
@@ -85,6 +93,6 @@ df.rename(columns={
 
 df = df.sort_values(by=["Country Code", "Year"])
 df = df[df["Year"] >= 1960]
-df.to_csv("four_country_control_variables.csv", index=False)
+df.to_csv(config.cross_processed("four_country_control_variables.csv"), index=False)
 
 
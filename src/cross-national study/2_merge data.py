@@ -1,21 +1,32 @@
 import pandas as pd
 import os
+import sys
 
-data_folder = '../../data/processed/cross-national study'
-agri_df = pd.read_csv(f"{data_folder}/agricultural_production_data_LongPanel.csv")
-climate_df = pd.read_csv(f"{data_folder}/climate_data.csv")
-control_df = pd.read_csv(f"{data_folder}/four_country_control_variables.csv")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from agriecon import config
+from agriecon.query import build_panel, default_sources
+from agriecon.validate import check_coverage, check_missing, check_unique, validate
 
-iso3_to_name = {
-    "JPN": "Japan",
-    "DEU": "Germany",
-    "ESP": "Spain",
-    "ITA": "Italy"
-}
-control_df["Country"] = control_df["Country Code"].map(iso3_to_name)
-climate_control_df = pd.merge(climate_df, control_df, on=["Country", "Year"], how="inner")
-agri_df = agri_df.rename(columns={"Area": "Country"})
-agri_df["Year"] = agri_df["Year"].astype(int)
-final_df = pd.merge(agri_df, climate_control_df, on=["Country", "Year"], how="left")
-final_df = final_df.drop(columns=["Country Code", "countryname"], errors="ignore")
-final_df.to_csv("merged_agri_climate_control.csv", index=False)
\ No newline at end of file
+sources = default_sources(config.CROSS_PROCESSED_DIR)
+
+# Check the join keys before building the panel: every control ISO3 code must
+# map to a country name used by FAO / OWID, and every agri country needs
+# climate and control rows (only the key columns are read here)
+agri_keys = pd.read_csv(sources["agri"], usecols=["Area", "Year"]).drop_duplicates()
+agri_keys = agri_keys.rename(columns={"Area": "Country"})
+climate_keys = pd.read_csv(sources["climate"], usecols=["Country", "Year"]).drop_duplicates()
+control_keys = pd.read_csv(sources["control"], usecols=["Country Code", "countryname", "Year"])
+control_keys["Country"] = control_keys["Country Code"].map(config.ISO3_TO_NAME)
+validate([
+    check_missing(control_keys, ["Country"], level="error"),
+    check_unique(control_keys, ["Country Code", "Year"]),
+    check_coverage(control_keys[["Country"]].drop_duplicates(), agri_keys, ["Country"]),
+    check_coverage(agri_keys[["Country"]].drop_duplicates(), climate_keys, ["Country"]),
+    check_coverage(agri_keys, climate_keys, ["Country", "Year"], level="warn"),
+    check_coverage(agri_keys, control_keys, ["Country", "Year"], level="warn"),
+], label="cross_national_merge")
+
+# agri LEFT JOIN (climate INNER JOIN controls) on Country and Year, run as one
+# DuckDB query; controls get "Country" from their ISO3 code. The result is
+# written straight to CSV without loading the three inputs into pandas.
+build_panel(sources, output=config.cross_processed("merged_agri_climate_control.csv"))
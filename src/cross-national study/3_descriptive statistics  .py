@@ -1,7 +1,17 @@
 import pandas as pd
 import os
-data_folder = '../../data/processed/cross-national study'
-df = pd.read_csv(f"{data_folder}/merged_agri_climate_control.csv")
-df.describe()
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from agriecon import config
+
+df = pd.read_csv(config.cross_processed("merged_agri_climate_control.csv"))
+describe = df.describe().T
 missing_rate = df.isnull().mean().sort_values(ascending=False).to_frame(name="Missing Rate")
-yearly_counts = df["Year"].value_counts().sort_index()
\ No newline at end of file
+yearly_counts = df["Year"].value_counts().sort_index().to_frame(name="Observations")
+
+# 保存结果，供 `python -m agriecon report` 汇总
+describe.round(4).to_csv(config.cross_processed("descriptive_stats.csv"))
+missing_rate.round(4).to_csv(config.cross_processed("missing_rate.csv"))
+yearly_counts.to_csv(config.cross_processed("yearly_counts.csv"))
+print(describe)
@@ -3,8 +3,13 @@ import seaborn as sns
 import matplotlib.pyplot as plt
 import pandas as pd
 import os
-data_folder = '../../data/processed/cross-national study'
-df = pd.read_csv(f"{data_folder}/merged_agri_climate_control.csv")
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from agriecon import config
+
+df = pd.read_csv(config.cross_processed("merged_agri_climate_control.csv"))
+figure_dir = config.CROSS_FIGURE_DIR
 ## 4.1 Time series
 plt.figure(figsize=(12, 6), dpi=300)
 sns.lineplot(data=df, x="Year", y="Temperature (°C)", hue="Country", errorbar=None)
@@ -13,7 +18,7 @@ plt.xlabel("Year")
 plt.ylabel("Temperature (°C)")
 plt.grid(True)
 
-plt.savefig("temperature_trend_highres.png", dpi=300)
+plt.savefig(os.path.join(figure_dir, "temperature_trend_highres.png"), dpi=300)
 
 import seaborn as sns
 import matplotlib.pyplot as plt
@@ -36,7 +41,7 @@ plt.ylabel("Precipitation (mm)", fontsize=12)
 plt.legend(title="Country", fontsize=10)
 plt.grid(True, linestyle='--', alpha=0.5)
 plt.tight_layout()
-plt.savefig("Annual Precipitation by Country.png", dpi=300)
+plt.savefig(os.path.join(figure_dir, "Annual Precipitation by Country.png"), dpi=300)
 
 
 ## 4.2 Bar plot
@@ -63,7 +68,7 @@ plt.ylabel("Crop", fontsize=12)
 # 网格与布局
 plt.grid(axis='x', linestyle='--', alpha=0.5)
 plt.tight_layout()
-plt.savefig("Top 10 Crops by Average Production.png", dpi=300)
+plt.savefig(os.path.join(figure_dir, "Top 10 Crops by Average Production.png"), dpi=300)
 
 
 ## 4.3 Scatter plots
@@ -93,4 +98,4 @@ plt.ylabel("Crop Yield (tons)", fontsize=12)
 plt.grid(True, linestyle='--', alpha=0.4)
 plt.tight_layout()
 
-plt.savefig("Wheat Yield vs. Temperature.png", dpi=300)
\ No newline at end of file
+plt.savefig(os.path.join(figure_dir, "Wheat Yield vs. Temperature.png"), dpi=300)
\ No newline at end of file
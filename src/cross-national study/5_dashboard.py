@@ -3,9 +3,12 @@ import seaborn as sns
 import matplotlib.pyplot as plt
 import pandas as pd
 import os
+import sys
 
-data_folder = '../../data/processed/cross-national study'
-df = pd.read_csv(f"{data_folder}/merged_agri_climate_control.csv")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from agriecon import config
+
+df = pd.read_csv(config.cross_processed("merged_agri_climate_control.csv"))
 
 # 页面标题
 st.title("Cross-National Agricultural & Climate Dashboard")
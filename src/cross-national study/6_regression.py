@@ -1,50 +1,44 @@
 import pandas as pd
-import numpy as np
 import statsmodels.api as sm
 import matplotlib.pyplot as plt
 import seaborn as sns
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from agriecon import config
+from agriecon.query import build_panel, default_sources
+from agriecon.spatial_hac import conley_cov, driscoll_kraay_cov, hac_results
+from agriecon.transforms import apply_transforms, print_audit
+
+# (1) Total production x climate x controls in one DuckDB query, joined on the
+# shared Country key (controls: ISO3 -> country name, see agriecon.query)
+merged_df = build_panel(
+    default_sources(config.CROSS_PROCESSED_DIR),
+    aggregate_items=True, collapse_climate=True, how="inner",
+)
 
-data_folder = '../../data/processed/cross-national study'
-climate_df = pd.read_csv(f"{data_folder}/climate_data.csv")
-agri_df = pd.read_csv(f"{data_folder}/agricultural_production_data_LongPanel.csv")
-control_df = pd.read_csv(f"{data_folder}/four_country_control_variables.csv")
-# (1) Climate cross-national study: Calculate average annual temperature by country and year
-climate_avg = climate_df.groupby(['Country', 'Year'], as_index=False)[
-    ['Temperature (°C)', 'Precipitation (mm)']
-].mean()
-
-climate_avg.rename(columns={
-    'Temperature (°C)': 'Avg_Temperature',
+# (2) Average annual temperature comes from the cached monthly cube features
+# (1_clean data.py); a year with missing months has no annual mean
+climate_features = pd.read_csv(config.cross_processed("climate_features.csv"))
+merged_df = pd.merge(merged_df.drop(columns=["Temperature (°C)"]), climate_features,
+                     on=["Country", "Year"], how="inner")
+merged_df.rename(columns={
+    'annual_mean': 'Avg_Temperature',
     'Precipitation (mm)': 'Avg_Precipitation'
 }, inplace=True)
 
-
-# (2) Filter for rows where Element = 'Production' and aggregate total production
-agri_prod = agri_df[agri_df['Element'] == 'Production']
-agri_total = agri_prod.groupby(['Area', 'Year'], as_index=False)['Value'].sum()
-agri_total.rename(columns={'Area': 'Country', 'Value': 'Total_Production'}, inplace=True)
-
-# (3) Control variables: Rename country column for consistency
-control_df.rename(columns={'countryname': 'Country'}, inplace=True)
-
-
-# Merge agricultural cross-national study with climate cross-national study
-merged_df = pd.merge(agri_total, climate_avg, on=['Country', 'Year'], how='inner')
-# Merge with control variables
-merged_df = pd.merge(merged_df, control_df, on=['Country', 'Year'], how='inner')
-# List of variables to be log-transformed
-log_vars = ['Total_Production', 'Real GDP per capita', 'Nominal GDP', 'Population',
-            'Government expenditure (%GDP)', 'Government revenue (%GDP)']
-# Remove any rows with non-positive values before applying logarithm
-for var in log_vars:
-    merged_df = merged_df[merged_df[var] > 0]
-# Create new columns for log-transformed variables
-merged_df['Log_Total_Production'] = np.log(merged_df['Total_Production'])
-merged_df['Log_GDP_per_capita'] = np.log(merged_df['Real GDP per capita'])
-merged_df['Log_Nominal_GDP'] = np.log(merged_df['Nominal GDP'])
-merged_df['Log_Population'] = np.log(merged_df['Population'])
-merged_df['Log_Gov_Expenditure'] = np.log(merged_df['Government expenditure (%GDP)'])
-merged_df['Log_Gov_Revenue'] = np.log(merged_df['Government revenue (%GDP)'])
+# Variables to be log-transformed; rows with non-positive values are removed first
+log_transforms = [
+    {"op": "log", "column": "Total_Production", "name": "Log_Total_Production"},
+    {"op": "log", "column": "Real GDP per capita", "name": "Log_GDP_per_capita"},
+    {"op": "log", "column": "Nominal GDP", "name": "Log_Nominal_GDP"},
+    {"op": "log", "column": "Population", "name": "Log_Population"},
+    {"op": "log", "column": "Government expenditure (%GDP)", "name": "Log_Gov_Expenditure"},
+    {"op": "log", "column": "Government revenue (%GDP)", "name": "Log_Gov_Revenue"},
+]
+merged_df, audit = apply_transforms(merged_df, log_transforms)
+print_audit(audit)
 
 # Create and save a correlation heatmap for selected numeric columns
 corr_matrix = merged_df[[
@@ -79,6 +73,18 @@ results = model.fit()
 # Print the summary of regression results
 print("\n[Regression Results]\n", results.summary())
 
+# Spatial / temporal HAC standard errors: neighbouring countries share weather shocks
+# Conley: errors of countries within 1500 km correlated in the same year, plus 3 years
+# of serial correlation within a country; Driscoll-Kraay: Newey-West on yearly score sums
+used = merged_df.loc[results.model.data.row_labels]
+lat = used['Country'].map(lambda c: config.COUNTRY_COORDS[c]['lat'])
+lon = used['Country'].map(lambda c: config.COUNTRY_COORDS[c]['lon'])
+conley = conley_cov(results.model.exog, results.resid, lat, lon, used['Year'],
+                    cutoff_km=1500, entity=used['Country'], lag_cutoff=3)
+dk = driscoll_kraay_cov(results.model.exog, results.resid, used['Year'], lags=3)
+print(hac_results(results, conley, "Conley (1500 km, 3 lags)").summary)
+print(hac_results(results, dk, "Driscoll-Kraay (3 lags)").summary)
+
 
 import matplotlib.pyplot as plt
 
@@ -0,0 +1,28 @@
+# Part 7: lagged / rolling climate features for the country panel
+import pandas as pd
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from agriecon import config
+from agriecon.features import add_panel_features, collapse_keys
+
+df = pd.read_csv(config.cross_processed("merged_agri_climate_control.csv"))
+
+# The merged file has several climate rows per Country x Item x Year, and some
+# items (eggs) are reported in two units, so collapse to one row per
+# Country x Item x Unit x Year before computing lags and rolling means
+climate_cols = ["Temperature (°C)", "Precipitation (mm)"]
+entity = ["Country", "Item", "Unit"]
+panel = collapse_keys(df, entity, "Year", ["Value"] + climate_cols)
+
+features = [
+    {"op": "lag", "column": "Temperature (°C)", "k": 1},
+    {"op": "lag", "column": "Precipitation (mm)", "k": 1},
+    {"op": "rolling_mean", "column": "Temperature (°C)", "window": 5},
+    {"op": "rolling_mean", "column": "Precipitation (mm)", "window": 5},
+    {"op": "anomaly", "column": "Temperature (°C)", "baseline": (1961, 1990)},
+    {"op": "anomaly", "column": "Precipitation (mm)", "baseline": (1961, 1990)},
+]
+panel = add_panel_features(panel, features, entity=entity, time="Year")
+panel.to_csv(config.cross_processed("merged_panel_features.csv"), index=False)
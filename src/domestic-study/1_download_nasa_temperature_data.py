@@ -14,7 +14,7 @@
 #     - For each city, we specify its latitude and longitude.
 #     - For each year from 2005 to 2023, we query NASA's POWER API for daily data.
 #     - The script sends requests for T2M_MAX (daily max temp) and T2M_MIN (min temp).
-#     - The downloaded CSV files are saved under `nasa_power_gdd_raw/`.
+#     - The downloaded CSV files are saved under `data/raw/domestic_study_data/nasa_power_gdd_raw/`.
 #
 # API Info:
 #     - Source: NASA POWER (https://power.larc.nasa.gov/)
@@ -27,18 +27,18 @@
 # --------------------------------------------
 
 import os
+import sys
 import requests
 import time
 
-cities = {
-    "Harbin": {"lat": 45.75, "lon": 126.63},
-    "Changchun": {"lat": 43.88, "lon": 125.35},
-    "Shenyang": {"lat": 41.80, "lon": 123.43}
-}
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from agriecon import config
 
-start_year = 2005
-end_year = 2023
-output_dir = "nasa_power_gdd_raw"
+cities = config.CITIES
+
+start_year = config.START_YEAR
+end_year = config.END_YEAR
+output_dir = config.NASA_RAW_DIR
 os.makedirs(output_dir, exist_ok=True)
 
 for city, info in cities.items():
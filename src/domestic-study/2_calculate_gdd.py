@@ -40,15 +40,20 @@ climate-yield relationships via econometric models.
 """
 
 import os
+import sys
 import pandas as pd
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from agriecon import config
+from agriecon.validate import check_range, check_sentinels, check_unique, validate
+
 # 设置路径
-input_dir = "../data/raw/domestic_study_data/nasa_power_gdd_raw"
-output_file = "../data/processed/domestic_study_data/annual_gdd_summary.csv"
-T_BASE = 10  # 基准温度
+input_dir = config.NASA_RAW_DIR
+output_file = config.domestic_processed("annual_gdd_summary.csv")
+T_BASE = config.T_BASE  # 基准温度
 
-# 结果存储列表
-summary = []
+# 日度数据列表
+daily = []
 
 # 遍历文件夹中所有文件
 for filename in os.listdir(input_dir):
@@ -60,22 +65,33 @@ for filename in os.listdir(input_dir):
         path = os.path.join(input_dir, filename)
         try:
             df = pd.read_csv(path, skiprows=10)  # 跳过前10行metadata
-            tmax = df["T2M_MAX"]
-            tmin = df["T2M_MIN"]
-
-            gdd = ((tmax + tmin) / 2 - T_BASE).clip(lower=0)
-            total_gdd = gdd.sum()
-
-            summary.append({
-                "City": city,
-                "Year": int(year),
-                "Annual_GDD": round(total_gdd, 2)
-            })
+            df["City"] = city
+            df["Year"] = int(year)
+            daily.append(df)
 
         except Exception as e:
             print(f"Error processing {filename}: {e}")
 
+daily_df = pd.concat(daily, ignore_index=True)
+
+# 数据校验：-999 缺测值、温度范围、城市-日期唯一
+temp_cols = ["T2M_MAX", "T2M_MIN"]
+temps = daily_df[temp_cols].mask(daily_df[temp_cols] == -999)  # 缺测值不计入 GDD
+validate([
+    check_sentinels(daily_df, temp_cols, level="warn"),
+    check_unique(daily_df, ["City", "YEAR", "DOY"]),
+    check_range(temps, "T2M_MAX", -60, 50),
+    check_range(temps, "T2M_MIN", -60, 50),
+], label="nasa_power_daily")
+daily_df[temp_cols] = temps
+
+gdd = ((daily_df["T2M_MAX"] + daily_df["T2M_MIN"]) / 2 - T_BASE).clip(lower=0)
+# 每个城市-年份单独求和再四舍五入（与逐文件 gdd.sum() 的结果逐位一致）
+summary_df = pd.DataFrame([
+    {"City": city, "Year": year, "Annual_GDD": round(g.sum(), 2)}
+    for (city, year), g in gdd.groupby([daily_df["City"], daily_df["Year"]])
+])
+
 # 输出整理结果
-summary_df = pd.DataFrame(summary)
 summary_df.sort_values(["City", "Year"], inplace=True)
 summary_df.to_csv(output_file, index=False)
\ No newline at end of file
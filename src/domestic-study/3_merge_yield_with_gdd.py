@@ -36,21 +36,31 @@
 #       such as predicting yields under climate scenarios, or classifying climate-sensitive crops.
 #
 # Note:
-#     This script is fully reproducible and path-resilient (uses relative paths based on script location).
+#     This script is fully reproducible and path-resilient (paths come from `agriecon.config`).
 # -------------------------------------------------------------
 
 import pandas as pd
 import os
+import sys
 
 # 获取当前脚本的绝对路径，并定位到 data 文件夹
 script_dir = os.path.dirname(os.path.abspath(__file__))
-raw_dir = os.path.join(script_dir, "../../data/raw/domestic_study_data")
-processed_dir = os.path.join(script_dir, "../../data/processed/domestic_study_data")
+sys.path.insert(0, os.path.join(script_dir, ".."))
+from agriecon import config
+from agriecon.validate import (check_bom, check_coverage, check_missing, check_range,
+                               check_schema, check_unique, validate)
+
+raw_dir = config.DOMESTIC_RAW_DIR
+processed_dir = config.DOMESTIC_PROCESSED_DIR
+
+yield_files = [os.path.join(raw_dir, f"{p}_yield_clean.csv") for p in config.PROVINCES]
+
+# 原始文件开头可能带 BOM（EF BB BF）：直接检查文件字节并报告；
+# pd.read_csv 默认 utf-8 读取时会去掉 BOM，表头仍为“指标”
+validate([check_bom(yield_files)], label="yield_headers")
 
 # 读取数据
-heilongjiang = pd.read_csv(os.path.join(raw_dir, "Heilongjiang_yield_clean.csv"))
-jilin = pd.read_csv(os.path.join(raw_dir, "Jilin_yield_clean.csv"))
-liaoning = pd.read_csv(os.path.join(raw_dir, "Liaoning_yield_clean.csv"))
+heilongjiang, jilin, liaoning = (pd.read_csv(path) for path in yield_files)
 gdd = pd.read_csv(os.path.join(processed_dir, "annual_gdd_summary.csv"))
 
 # 添加省份
@@ -68,11 +78,17 @@ df_long = df_long.dropna(subset=["year"])                 # 删除year列为NaN
 df_long["year"] = df_long["year"].astype(int)             # 再转为整数
 
 # 城市对应省份
-gdd["province"] = gdd["City"].map({
-    "Harbin": "Heilongjiang",
-    "Changchun": "Jilin",
-    "Shenyang": "Liaoning"
-})
+gdd["province"] = gdd["City"].map(config.CITY_TO_PROVINCE)
+
+# 合并前校验：键唯一、产量非负、每个省份-年份都有 GDD
+validate([
+    check_schema(df_long, {"指标": "str", "province": "str", "year": "int", "value": "float"}),
+    check_unique(df_long, ["指标", "province", "year"]),
+    check_range(df_long, "value", 0, None),
+    check_missing(gdd, ["province"], level="error"),
+    check_unique(gdd, ["province", "Year"]),
+    check_coverage(df_long, gdd, ["province", "year"], ["province", "Year"]),
+], label="yield_gdd_merge")
 
 # 合并 GDD
 panel = pd.merge(df_long, gdd[["province", "Year", "Annual_GDD"]],
@@ -81,5 +97,5 @@ panel = pd.merge(df_long, gdd[["province", "Year", "Annual_GDD"]],
                  how="left").drop(columns=["Year"])
 
 # 保存
-output_path = os.path.join(script_dir, "../../data/processed/domestic_study_data/panel_yield_gdd.csv")
+output_path = config.domestic_processed("panel_yield_gdd.csv")
 panel.to_csv(output_path, index=False)
\ No newline at end of file
@@ -25,73 +25,85 @@ Purpose:
 import pandas as pd
 import statsmodels.formula.api as smf
 import os
+import sys
 
 # 加载数据
 script_dir = os.path.dirname(os.path.abspath(__file__))
-data_path = os.path.join(script_dir, "../../data/processed/domestic_study_data/panel_yield_gdd.csv")
+sys.path.insert(0, os.path.join(script_dir, ".."))
+from agriecon import config
+from agriecon.results_store import cached_fit
+from agriecon.spatial_hac import ESTIMATOR_VERSION, conley_cov, driscoll_kraay_cov, hac_results
+from agriecon.transforms import apply_transforms, print_audit
+from agriecon.validate import check_missing, check_range, check_schema, check_unique, validate
+
+data_path = config.domestic_processed("panel_yield_gdd.csv")
 df = pd.read_csv(data_path)
 
-# 数据预处理
-df = df[df["value"].notna()]  # 删除缺失值
-df["log_yield"] = df["value"].apply(lambda x: pd.NA if x <= 0 else pd.np.log(x))
-df = df.dropna(subset=["log_yield", "Annual_GDD"])
+# 数据预处理：删除缺失值与非正产量，并取对数
+TRANSFORMS = [{"op": "log", "column": "value", "name": "log_yield"}]
+df, audit = apply_transforms(df, TRANSFORMS, required=["Annual_GDD"])
+print_audit(audit)
+
+# 估计前校验：面板键唯一、GDD 在合理范围内、模型变量无缺失
+validate([
+    check_schema(df, {"log_yield": "float", "Annual_GDD": "float", "year": "int",
+                      "province": "str", "指标": "str"}),
+    check_unique(df, ["province", "year", "指标"]),
+    check_range(df, "Annual_GDD", 0, 6000),
+    check_missing(df, ["log_yield", "Annual_GDD", "year", "province", "指标"], level="error"),
+], label="modelC_input")
 
 # 回归模型 C：控制 year、crop（指标）、province 固定效应
-model = smf.ols("log_yield ~ Annual_GDD + C(year) + C(province) + C(指标)", data=df).fit()
+# 结果按 (数据, 公式, 固定效应, 协方差类型) 指纹缓存在 results/store/，指纹相同则不重新估计
+formula = "log_yield ~ Annual_GDD + C(year) + C(province) + C(指标)"
+model_df = df[["log_yield", "Annual_GDD", "year", "province", "指标"]]
+result = cached_fit(
+    model_df, formula,
+    fit=lambda: smf.ols(formula, data=model_df).fit(),
+    label="modelC", fe=["year", "province", "指标"], cov_type="nonrobust",
+)
 
 # 打印与保存结果
-print(model.summary())
+print(result["summary"])
+if result["cached"]:
+    print("(cached result, fingerprint", result["meta"]["fingerprint"] + ")")
 
-output_path = os.path.join(script_dir, "../../results/regression_modelC_summary.txt")
+output_path = os.path.join(config.RESULTS_DIR, "regression_modelC_summary.txt")
 os.makedirs(os.path.dirname(output_path), exist_ok=True)
 with open(output_path, "w", encoding="utf-8") as f:
-    f.write(model.summary().as_text())
+    f.write(result["summary"])
 
 print("Regression complete. Summary saved to:", output_path)
 
-
-
-"""
-# Regression Result Interpretation / 回归结果分析
-
-This model investigates how annual accumulated temperature (Annual GDD) affects crop yield in northeastern China,
-using a panel dataset that includes three provinces (Heilongjiang, Jilin, Liaoning), multiple crops, and the years 2005–2023.
-
-该模型分析了年累计气温（Annual GDD）对中国东北地区单位面积作物产量的影响，控制了年份、作物种类和省份的固定效应，
-使用的数据覆盖2005至2023年，涵盖黑龙江、吉林和辽宁三省的多个作物。
-
-Key findings:
-1. The coefficient of `Annual_GDD` is **positive and statistically significant** at the 5% level.
-   This suggests that higher cumulative temperatures during the growing season are associated with higher crop yields on average,
-   after controlling for province-specific, crop-specific, and year-specific characteristics.
-
-2. The model controls for:
-   - Year fixed effects (`C(year)`): to absorb common shocks like national weather anomalies or policy changes.
-   - Province fixed effects (`C(province)`): to account for regional heterogeneity (soil, infrastructure, farming practices).
-   - Crop fixed effects (`C(指标)`): to distinguish between heat-tolerant vs. sensitive crops.
-
-主要发现：
-1. 年累计气温（Annual GDD）的系数为**正且显著**（p值小于0.05），表明在控制了省份、作物与年份影响后，气温上升对作物产量整体具有积极影响。
-
-2. 模型控制了：
-   - 年份固定效应：用于剔除全国性天气异常、农业补贴等因素；
-   - 省份固定效应：考虑了不同省份的土壤条件、基础设施、管理方式差异；
-   - 作物固定效应：剔除不同作物对气温敏感程度不同所带来的偏误。
-
-Implications:
-- A positive effect of GDD implies that, within the current climatic range, moderate warming may benefit agricultural output in this region.
-- However, this result does not guarantee a continued positive effect under extreme heat conditions or future climate volatility.
-- These findings could guide climate adaptation strategies and crop selection for temperature-sensitive farming.
-
-启示：
-- 气温升高在当前范围内对产量有益，但不意味着在更极端的气候下仍然成立；
-- 结果可用于支持农业气候适应政策与高温敏感作物的筛选。
-
-Note:
-- This is an associative model, not causal. Further studies (e.g., using instrumental variables or weather shocks) may be needed to establish causality.
-- The fixed effect structure helps mitigate omitted variable bias, but data quality and representativeness still matter.
-
-注意：
-- 此模型为相关性分析，尚无法断言因果关系；
-- 固定效应能减少遗漏变量偏误，但仍依赖于数据的覆盖度与准确性。
-"""
\ No newline at end of file
+# 空间/时间相关稳健标准误：三省共享天气冲击
+# Conley：同一年份 800 km 内的省份误差相关，并允许同一 省份×作物 2 年内的序列相关
+# Driscoll–Kraay：对每年截面加总得分做 Newey-West
+CONLEY = {"cutoff_km": 800, "lag_cutoff": 2, "kernel": "bartlett"}
+DK_LAGS = 2
+
+
+def fit_hac(kind):
+    res = smf.ols(formula, data=model_df).fit()
+    X, u = res.model.exog, res.resid.to_numpy()
+    if kind == "conley":
+        lat = model_df["province"].map(lambda p: config.PROVINCE_COORDS[p]["lat"])
+        lon = model_df["province"].map(lambda p: config.PROVINCE_COORDS[p]["lon"])
+        entity = model_df["province"] + "|" + model_df["指标"]
+        cov = conley_cov(X, u, lat, lon, model_df["year"], entity=entity, **CONLEY)
+        return hac_results(res, cov, "Conley")
+    cov = driscoll_kraay_cov(X, u, model_df["year"], lags=DK_LAGS)
+    return hac_results(res, cov, "Driscoll-Kraay")
+
+
+fe = ["year", "province", "指标"]
+conley = cached_fit(model_df, formula, lambda: fit_hac("conley"), label="modelC_conley",
+                    fe=fe, cov_type="conley", cov_kwds=CONLEY, estimator=ESTIMATOR_VERSION)
+dk = cached_fit(model_df, formula, lambda: fit_hac("dk"), label="modelC_dk",
+                fe=fe, cov_type="driscoll-kraay", cov_kwds={"lags": DK_LAGS},
+                estimator=ESTIMATOR_VERSION)
+print("\nAnnual_GDD standard errors:")
+for name, res in [("OLS", result), ("Conley", conley), ("Driscoll-Kraay", dk)]:
+    print(f"  {name:15s} coef = {res['params']['Annual_GDD']:.6f}  se = {res['bse']['Annual_GDD']:.6f}"
+          f"  p = {res['pvalues']['Annual_GDD']:.3f}")
+
+# 结果解读见 docs/report_notes/domestic_modelC.md（由 `python -m agriecon report` 收入报告）
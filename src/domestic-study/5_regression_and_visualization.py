@@ -33,21 +33,25 @@ Author: Yu Kaijin
 """
 
 import pandas as pd
-import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 import statsmodels.formula.api as smf
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from agriecon import config
+from agriecon.transforms import apply_transforms, print_audit
 
 # 数据读取
-data_path = os.path.join(os.path.dirname(__file__), "../../data/processed/domestic_study_data/panel_yield_gdd.csv")
+data_path = config.domestic_processed("panel_yield_gdd.csv")
 df = pd.read_csv(data_path)
 
 # 数据筛选与处理
 df = df[df["指标"] == "粮食单位面积产量(公斤/公顷)"]
-df = df.dropna(subset=["value", "Annual_GDD"])
-df["log_yield"] = df["value"].apply(lambda x: np.log(x) if x > 0 else np.nan)
-df = df.dropna(subset=["log_yield"])
+TRANSFORMS = [{"op": "log", "column": "value", "name": "log_yield"}]
+df, audit = apply_transforms(df, TRANSFORMS, required=["Annual_GDD"])
+print_audit(audit)
 
 # OLS 回归，控制年份固定效应
 model = smf.ols("log_yield ~ Annual_GDD + C(year)", data=df).fit()
@@ -69,7 +73,7 @@ plt.show()
 
 # 保存描述统计结果
 desc = df[["value", "Annual_GDD", "log_yield"]].describe()
-desc.to_csv(os.path.join(os.path.dirname(__file__), "../../data/processed/domestic_study_data/descriptive_stats.csv"))
+desc.to_csv(config.domestic_processed("descriptive_stats.csv"))
 print("descriptive_stats.csv")
 
 # === OLS Regression Results Summary ===
@@ -0,0 +1,36 @@
+"""
+Title: Lagged and Multi-Year GDD Features for the Province Panel
+
+This script adds lagged / lead GDD, 3-year rolling GDD and GDD anomalies
+(deviation from each province's 2005–2014 mean) to `panel_yield_gdd.csv`,
+so that regressions can test whether yields respond to last year's heat or
+to multi-year warming rather than only the same-year GDD.
+
+Output:
+    `panel_yield_gdd_features.csv` in `data/processed/domestic_study_data/`
+"""
+
+import pandas as pd
+import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(script_dir, ".."))
+from agriecon import config
+from agriecon.features import add_panel_features
+
+panel = pd.read_csv(config.domestic_processed("panel_yield_gdd.csv"))
+
+# 每个 省份 × 作物 是一个面板个体
+FEATURES = [
+    {"op": "lag", "column": "Annual_GDD", "k": 1},
+    {"op": "lead", "column": "Annual_GDD", "k": 1},
+    {"op": "rolling_mean", "column": "Annual_GDD", "window": 3},
+    {"op": "anomaly", "column": "Annual_GDD", "baseline": (2005, 2014)},
+    {"op": "lag", "column": "value", "k": 1},
+]
+panel = add_panel_features(panel, FEATURES, entity=["province", "指标"], time="year")
+
+output_path = config.domestic_processed("panel_yield_gdd_features.csv")
+panel.to_csv(output_path, index=False)
+print("Panel features saved to:", output_path)
@@ -0,0 +1,49 @@
+"""
+Title: Predicted Yields under Warming Scenarios
+
+This script uses the fitted model C (log_yield ~ Annual_GDD + Year/Province/Crop FE,
+see 4_run_regression_panel_yield_gdd.py) to predict yields when the daily NASA
+temperatures are shifted by +0 to +3 °C. GDD is recomputed from the shifted daily
+series for each city-year, and predictions with 95% bands are produced for every
+observed province × crop pair, year and scenario in one vectorized pass.
+
+Output:
+    `scenario_yield_predictions.csv` in `data/processed/domestic_study_data/`
+"""
+
+import pandas as pd
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from agriecon import config
+from agriecon.results_store import load_result
+from agriecon.scenarios import load_daily_tmean, scenario_gdd, score_scenarios, scenario_frame
+
+result = load_result("modelC")
+if result is None:
+    sys.exit("Model C is not in results/store yet; run 4_run_regression_panel_yield_gdd.py first.")
+
+# 情景：日均温整体上移 0、1、2、3 °C
+SHIFTS = [0.0, 1.0, 2.0, 3.0]
+daily = load_daily_tmean()
+gdd = scenario_gdd(daily["tmean"], SHIFTS)  # (scenario, city, year)
+
+# 要预测的 省份 × 作物：模型样本中出现过的组合（不外推到未观测的省份-作物）
+panel = pd.read_csv(config.domestic_processed("panel_yield_gdd.csv"))
+pairs = panel.loc[panel["value"] > 0, ["province", "指标"]].drop_duplicates()
+grid = pairs.merge(pd.DataFrame({"year": daily["years"]}), how="cross")
+
+# 每行对应的 城市 / 年份 下标，直接从 GDD 数组中取值
+province_to_city = {p: c for c, p in config.CITY_TO_PROVINCE.items()}
+city_idx = grid["province"].map(province_to_city).map(daily["cities"].index).to_numpy()
+year_idx = grid["year"].to_numpy() - daily["years"][0]
+climate = {"Annual_GDD": gdd[:, city_idx, year_idx]}
+
+scored = score_scenarios(result, grid, climate, method="analytic")
+predictions = scenario_frame(grid, SHIFTS, climate, scored)
+
+output_path = config.domestic_processed("scenario_yield_predictions.csv")
+predictions.to_csv(output_path, index=False)
+print("Scenario predictions saved to:", output_path)
+print(predictions.groupby("scenario_shift")[["Annual_GDD", "pred_yield"]].mean().round(2))